@@ -2,6 +2,7 @@ from sqlalchemy import MetaData, text
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from typing import AsyncGenerator
+import asyncio
 import logging
 try:
     from .config import auth_settings
@@ -62,8 +63,20 @@ async def create_session():
     """Create a new async database session"""
     return AsyncSessionLocal()
 
+# Set once the schema has been ensured; later calls return without awaiting anything
+_database_initialized = False
+_init_lock = asyncio.Lock()
+
 async def init_database_async():
     """Initialize database tables asynchronously (following ledger pattern)"""
+    if _database_initialized:
+        return
+    async with _init_lock:
+        if not _database_initialized:
+            await _init_database()
+
+async def _init_database():
+    global _database_initialized
     try:
         # Import models to ensure they are registered
         try:
@@ -88,6 +101,7 @@ async def init_database_async():
             await conn.execute(text("GRANT ALL ON ALL SEQUENCES IN SCHEMA auth TO mguser;"))
             logger.info("[SUCCESS] Database tables ensured successfully in auth schema")
         
+        _database_initialized = True
     except Exception as e:
         logger.error(f"[ERROR] Database initialization failed (async): {e}")
         raise
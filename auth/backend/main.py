@@ -53,7 +53,7 @@ async def lifespan(app: FastAPI):
             async with await create_session() as session:
                 # Check if any superuser/admin exists
                 from sqlalchemy import select
-                result = await session.execute(select(User).where(User.is_superuser == True))
+                result = await session.execute(select(User.id).where(User.is_superuser == True).limit(1))
                 existing_admin = result.scalar_one_or_none()
                 if not existing_admin:
                     logger.info("No admin found; creating default admin user")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script for Auth Service
+This script converts audit_logs.details from JSON text to a JSONB column.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the auth module to the path
+auth_path = Path(__file__).parent
+sys.path.insert(0, str(auth_path))
+
+try:
+    from database import async_engine
+    from sqlalchemy import text
+    import logging
+except ImportError as e:
+    print(f"Error importing modules: {e}")
+    sys.exit(1)
+
+# Setup basic logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def migrate_database():
+    """Migrate audit_logs.details to JSONB"""
+    try:
+        async with async_engine.begin() as conn:
+            logger.info("[MIGRATION] Starting database migration...")
+            
+            result = await conn.execute(text("""
+                SELECT data_type FROM information_schema.columns 
+                WHERE table_schema = 'auth' AND table_name = 'audit_logs' AND column_name = 'details'
+            """))
+            column_info = result.fetchone()
+            
+            if column_info and column_info[0] != 'jsonb':
+                logger.info(f"[MIGRATION] details column is {column_info[0]}, converting to jsonb...")
+                await conn.execute(text("""
+                    ALTER TABLE auth.audit_logs 
+                    ALTER COLUMN details TYPE jsonb USING details::jsonb
+                """))
+                logger.info("[MIGRATION] details column is now jsonb")
+            else:
+                logger.info("[MIGRATION] details column is already jsonb or doesn't exist")
+            
+            # Supports containment queries (details @> '{...}') for audit filtering
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_audit_logs_details 
+                ON auth.audit_logs USING GIN (details jsonb_path_ops)
+            """))
+            logger.info("[MIGRATION] Ensured GIN index on audit_logs.details")
+            
+            logger.info("[MIGRATION] Database migration completed successfully")
+            return True
+            
+    except Exception as e:
+        logger.error(f"[MIGRATION] Migration failed: {e}")
+        return False
+
+async def main():
+    """Main migration function"""
+    print("🔧 Database Migration for Auth Service")
+    print("="*50)
+    
+    success = await migrate_database()
+    
+    if success:
+        print("✅ Migration completed successfully!")
+        return True
+    else:
+        print("❌ Migration failed!")
+        return False
+
+if __name__ == "__main__":
+    try:
+        success = asyncio.run(main())
+        if not success:
+            sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n❌ Migration cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Migration error: {e}")
+        sys.exit(1)
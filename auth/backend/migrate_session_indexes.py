@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script for Auth Service
+This script adds user_sessions.ended_at and the partial indexes over open and live sessions.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the auth module to the path
+auth_path = Path(__file__).parent
+sys.path.insert(0, str(auth_path))
+
+try:
+    from database import async_engine
+    from sqlalchemy import text
+    import logging
+except ImportError as e:
+    print(f"Error importing modules: {e}")
+    sys.exit(1)
+
+# Setup basic logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def migrate_database():
+    """Add ended_at and the session partial indexes"""
+    try:
+        async with async_engine.begin() as conn:
+            logger.info("[MIGRATION] Starting database migration...")
+            
+            await conn.execute(text("""
+                ALTER TABLE auth.user_sessions 
+                ADD COLUMN IF NOT EXISTS ended_at TIMESTAMP
+            """))
+            logger.info("[MIGRATION] Ensured user_sessions.ended_at column")
+            
+            # Serves get_user_sessions(active_only=True) as a bounded index scan
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_user_sessions_active 
+                ON auth.user_sessions (user_id, last_activity DESC) 
+                WHERE ended_at IS NULL
+            """))
+            logger.info("[MIGRATION] Ensured idx_user_sessions_active")
+            
+            # Serves cleanup_expired_sessions
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_user_sessions_open_activity 
+                ON auth.user_sessions (last_activity) 
+                WHERE ended_at IS NULL
+            """))
+            logger.info("[MIGRATION] Ensured idx_user_sessions_open_activity")
+            
+            # Serves deactivate_expired_sessions
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_user_sessions_live_expiry 
+                ON auth.user_sessions (expires_at) 
+                WHERE is_active
+            """))
+            logger.info("[MIGRATION] Ensured idx_user_sessions_live_expiry")
+            
+            logger.info("[MIGRATION] Database migration completed successfully")
+            return True
+            
+    except Exception as e:
+        logger.error(f"[MIGRATION] Migration failed: {e}")
+        return False
+
+async def main():
+    """Main migration function"""
+    print("🔧 Database Migration for Auth Service")
+    print("="*50)
+    
+    success = await migrate_database()
+    
+    if success:
+        print("✅ Migration completed successfully!")
+        return True
+    else:
+        print("❌ Migration failed!")
+        return False
+
+if __name__ == "__main__":
+    try:
+        success = asyncio.run(main())
+        if not success:
+            sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n❌ Migration cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Migration error: {e}")
+        sys.exit(1)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from uuid import uuid4
 import enum
@@ -68,7 +69,15 @@ class RefreshToken(Base):
 
 class UserSession(Base):
     __tablename__ = "user_sessions"
-    __table_args__ = {'schema': SCHEMA_NAME}
+    __table_args__ = (
+        # Partial index so expired-session cleanup only scans open sessions
+        Index('idx_user_sessions_open_activity', 'last_activity', postgresql_where=text('ended_at IS NULL')),
+        # Partial ordered index serving get_user_sessions(active_only=True)
+        Index('idx_user_sessions_active', 'user_id', text('last_activity DESC'), postgresql_where=text('ended_at IS NULL')),
+        # Partial index over live sessions serving deactivate_expired_sessions
+        Index('idx_user_sessions_live_expiry', 'expires_at', postgresql_where=text('is_active')),
+        {'schema': SCHEMA_NAME}
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid4()))
     user_id = Column(String, nullable=False, index=True)
@@ -83,6 +92,7 @@ class UserSession(Base):
     is_active = Column(Boolean, default=True)
     last_activity = Column(DateTime, default=func.now())
     expires_at = Column(DateTime, nullable=False)
+    ended_at = Column(DateTime)
     
     # Timestamps
     created_at = Column(DateTime, server_default=func.now())
@@ -99,7 +109,7 @@ class AuditLog(Base):
     resource_id = Column(String(50))
     
     # Action details
-    details = Column(Text)  # JSON string with additional info
+    details = Column(JSONB)  # Additional info, stored as binary JSON
     ip_address = Column(String(45))
     user_agent = Column(Text)
     
@@ -1,39 +1,55 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+import jwt
 import logging
 
 try:
     from .database import get_db
-    from .service import AuthService
+    from .service import AuthService, AuthenticatedUser
     from .schemas import (
         UserCreate, UserResponse, UserUpdate, UserLogin, TokenResponse,
-        RefreshTokenRequest, PasswordChange, RoleUpdate, LoginResponseWithUser
+        RefreshTokenRequest, PasswordChange, RoleUpdate, LoginResponseWithUser,
+        UserRoleEnum
     )
-    from .utils import JWTManager
+    from .utils import JWTManager, PermissionManager
     from .models import User
+    from .config import auth_settings
 except ImportError:
     from database import get_db
-    from service import AuthService
+    from service import AuthService, AuthenticatedUser
     from schemas import (
         UserCreate, UserResponse, UserUpdate, UserLogin, TokenResponse,
-        RefreshTokenRequest, PasswordChange, RoleUpdate, LoginResponseWithUser
+        RefreshTokenRequest, PasswordChange, RoleUpdate, LoginResponseWithUser,
+        UserRoleEnum
     )
-    from utils import JWTManager
+    from utils import JWTManager, PermissionManager
     from models import User
+    from config import auth_settings
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
-router = APIRouter()
+# Responses are rendered with orjson instead of the stdlib json encoder
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Roles allowed to read other users' accounts
+_USER_READER_ROLES = frozenset({"admin", "manager"})
 
 # Helper function to get current user
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """Get current authenticated user"""
+    # Resolved once per request, however many dependencies ask for it
+    cached = getattr(request.state, "current_user", None)
+    if cached is not None:
+        return cached
+    
     token = credentials.credentials
     token_data = JWTManager.verify_token(token)
     
@@ -45,7 +61,7 @@ async def get_current_user(
         )
     
     service = AuthService(db)
-    user = await service.get_user_by_id(token_data.user_id)
+    user = await service.get_authenticated_user(token_data.user_id)
     
     if user is None or not user.is_active:
         raise HTTPException(
@@ -53,6 +69,7 @@ async def get_current_user(
             detail="User not found or inactive"
         )
     
+    request.state.current_user = user
     return user
 
 def get_client_info(request: Request) -> tuple:
@@ -69,8 +86,6 @@ async def debug_token(
     """Debug token - shows token payload (for development only)"""
     token = credentials.credentials
     try:
-        from jose import jwt
-        from config import auth_settings
         payload = jwt.decode(
             token, 
             auth_settings.SECRET_KEY, 
@@ -155,6 +170,7 @@ async def login(
             "user_id": user.id,
             "email": user.email,
             "role": user.role,
+            "permissions": PermissionManager.get_permission_claims(user.role),
             "sub": user.id  # JWT standard subject claim
         }
         access_token = JWTManager.create_access_token(data=token_data)
@@ -164,12 +180,12 @@ async def login(
         return LoginResponseWithUser(
             access_token=access_token,
             token_type="bearer",
-            user=UserResponse(
+            user=UserResponse.model_construct(
                 id=user.id,
                 username=user.username,
                 email=user.email,
                 full_name=user.full_name,
-                role=user.role,
+                role=UserRoleEnum(user.role),
                 is_active=user.is_active,
                 is_verified=user.is_verified,
                 created_at=user.created_at,
@@ -217,6 +233,7 @@ async def refresh_token(
             "user_id": user.id,
             "email": user.email,
             "role": user.role,
+            "permissions": PermissionManager.get_permission_claims(user.role),
             "sub": user.id
         }
         access_token = JWTManager.create_access_token(data=token_data)
@@ -246,11 +263,11 @@ async def get_profile(
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user profile"""
-    return UserResponse(
+    return UserResponse.model_construct(
         id=current_user.id,
         email=current_user.email,
         full_name=current_user.full_name,
-        role=current_user.role,
+        role=UserRoleEnum(current_user.role),
         is_active=current_user.is_active,
         created_at=current_user.created_at,
         updated_at=current_user.updated_at
@@ -267,11 +284,11 @@ async def update_profile(
         service = AuthService(db)
         updated_user = await service.update_user(current_user.id, user_update)
         
-        return UserResponse(
+        return UserResponse.model_construct(
             id=updated_user.id,
             email=updated_user.email,
             full_name=updated_user.full_name,
-            role=updated_user.role,
+            role=UserRoleEnum(updated_user.role),
             is_active=updated_user.is_active,
             created_at=updated_user.created_at,
             updated_at=updated_user.updated_at
@@ -331,7 +348,7 @@ async def list_users(
     """List all users (admin only)"""
     ip, _ = get_client_info(request)
     logger.info(f"auth.users.list.attempt by_user_id={current_user.id} role={current_user.role} ip={ip}")
-    if current_user.role not in ["admin", "manager"]:
+    if current_user.role not in _USER_READER_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
@@ -342,12 +359,12 @@ async def list_users(
         users = await service.get_all_users()
         
         response = [
-            UserResponse(
+            UserResponse.model_construct(
                 id=user.id,
                 email=user.email,
                 full_name=user.full_name,
                 username=user.username,
-                role=user.role,
+                role=UserRoleEnum(user.role),
                 is_active=user.is_active,
                 created_at=user.created_at,
                 updated_at=user.updated_at
@@ -394,11 +411,11 @@ async def create_user(
         # Create new user
         user = await service.create_user(user_create)
         
-        result = UserResponse(
+        result = UserResponse.model_construct(
             id=user.id,
             email=user.email,
             full_name=user.full_name,
-            role=user.role,
+            role=UserRoleEnum(user.role),
             is_active=user.is_active,
             created_at=user.created_at,
             updated_at=user.updated_at
@@ -425,7 +442,7 @@ async def get_user(
     """Get user by ID (admin/manager only)"""
     ip, _ = get_client_info(request)
     logger.info(f"auth.user.get.attempt target_user_id={user_id} by_user_id={current_user.id} role={current_user.role} ip={ip}")
-    if current_user.role not in ["admin", "manager"]:
+    if current_user.role not in _USER_READER_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
@@ -441,11 +458,11 @@ async def get_user(
                 detail="User not found"
             )
         
-        result = UserResponse(
+        result = UserResponse.model_construct(
             id=user.id,
             email=user.email,
             full_name=user.full_name,
-            role=user.role,
+            role=UserRoleEnum(user.role),
             is_active=user.is_active,
             created_at=user.created_at,
             updated_at=user.updated_at
@@ -491,11 +508,11 @@ async def update_user(
         
         updated_user = await service.update_user(user_id, user_update)
         
-        result = UserResponse(
+        result = UserResponse.model_construct(
             id=updated_user.id,
             email=updated_user.email,
             full_name=updated_user.full_name,
-            role=updated_user.role,
+            role=UserRoleEnum(updated_user.role),
             is_active=updated_user.is_active,
             created_at=updated_user.created_at,
             updated_at=updated_user.updated_at
@@ -582,21 +599,19 @@ async def set_user_role(
     
     try:
         service = AuthService(db)
-        user = await service.get_user_by_id(user_id)
+        updated_user = await service.set_user_role(user_id, role_update.role)
         
-        if not user:
+        if not updated_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        updated_user = await service.set_user_role(user_id, role_update.role)
-        
-        result = UserResponse(
+        result = UserResponse.model_construct(
             id=updated_user.id,
             email=updated_user.email,
             full_name=updated_user.full_name,
-            role=updated_user.role,
+            role=UserRoleEnum(updated_user.role),
             is_active=updated_user.is_active,
             created_at=updated_user.created_at,
             updated_at=updated_user.updated_at
@@ -637,21 +652,19 @@ async def deactivate_user(
     
     try:
         service = AuthService(db)
-        user = await service.get_user_by_id(user_id)
+        updated_user = await service.deactivate_user(user_id)
         
-        if not user:
+        if not updated_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        updated_user = await service.deactivate_user(user_id)
-        
-        result = UserResponse(
+        result = UserResponse.model_construct(
             id=updated_user.id,
             email=updated_user.email,
             full_name=updated_user.full_name,
-            role=updated_user.role,
+            role=UserRoleEnum(updated_user.role),
             is_active=updated_user.is_active,
             created_at=updated_user.created_at,
             updated_at=updated_user.updated_at
@@ -686,21 +699,19 @@ async def activate_user(
     
     try:
         service = AuthService(db)
-        user = await service.get_user_by_id(user_id)
+        updated_user = await service.activate_user(user_id)
         
-        if not user:
+        if not updated_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        updated_user = await service.activate_user(user_id)
-        
-        result = UserResponse(
+        result = UserResponse.model_construct(
             id=updated_user.id,
             email=updated_user.email,
             full_name=updated_user.full_name,
-            role=updated_user.role,
+            role=UserRoleEnum(updated_user.role),
             is_active=updated_user.is_active,
             created_at=updated_user.created_at,
             updated_at=updated_user.updated_at
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
@@ -153,7 +153,7 @@ class AuditLogResponse(BaseModel):
     action: str
     resource: Optional[str]
     resource_id: Optional[str]
-    details: Optional[str]
+    details: Optional[Dict[str, Any]]
     ip_address: Optional[str]
     success: bool
     error_message: Optional[str]
@@ -1,9 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, or_, func, select, update, delete
+from sqlalchemy import and_, func, select, update, delete, bindparam
+from sqlalchemy.orm import load_only
 from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
-import json
+import re
+import secrets
+from cachetools import TTLCache
 
 try:
     from .models import User, RefreshToken, UserSession, AuditLog
@@ -18,37 +22,81 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Hot-path lookups built once at import; callers bind parameters per execution
+_GET_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_GET_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
+# Verified against when the email is unknown so misses cost the same as wrong passwords
+_DUMMY_PASSWORD_HASH = AuthUtils.get_password_hash(secrets.token_urlsafe(16))
+
+# Coarse permissions per role for AuthService.check_permission, built once
+_ROLE_PERMISSIONS = {
+    "admin": frozenset({"read", "write", "delete", "manage_users", "view_audit"}),
+    "manager": frozenset({"read", "write", "manage_team"}),
+    "employee": frozenset({"read", "write"}),
+    "viewer": frozenset({"read"}),
+}
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Read-only copy of the user fields request authentication needs"""
+    id: str
+    email: str
+    full_name: str
+    role: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+# Users resolved while authenticating requests, shared across requests as
+# snapshots (never session-bound ORM instances). Every AuthService method that
+# modifies a user drops its entry; the TTL bounds staleness across worker processes.
+_authenticated_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
 class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        # AuthService is built per request, so this cache never outlives the request's session
+        self._user_cache: Dict[str, User] = {}
     
     # User Management
     async def create_user(self, user_data: UserCreate, created_by: Optional[str] = None) -> User:
         """Create a new user"""
         # Check if user already exists
-        stmt = select(User).where(or_(User.email == user_data.email))
+        stmt = select(User.id).where(User.email == user_data.email).limit(1)
         result = await self.db.execute(stmt)
-        existing_user = result.scalar_one_or_none()
+        existing_user_id = result.scalar_one_or_none()
         
-        if existing_user:
+        if existing_user_id:
             raise ValueError("Email already exists")
-        # Enforce bcrypt max password length (72 bytes) to prevent runtime errors
-        if len(user_data.password.encode('utf-8')) > 72:
-            raise ValueError("Password too long (max 72 characters)")
         
         # Hash password
-        hashed_password = AuthUtils.get_password_hash(user_data.password)
+        hashed_password = await AuthUtils.aget_password_hash(user_data.password)
         
         # Auto-generate username from email if not provided
         username = user_data.email.split('@')[0].lower()
-        # Make username unique by checking for duplicates
+        # Make username unique: fetch only the taken candidates (base, base1, base2, ...)
+        # in one query, then pick a free suffix
         base_username = username
+        stmt_check = select(User.username).where(
+            (User.username == base_username)
+            | User.username.regexp_match(f"^{re.escape(base_username)}[0-9]+$")
+        )
+        taken = set((await self.db.execute(stmt_check)).scalars())
         counter = 1
-        while True:
-            stmt_check = select(User).where(User.username == username)
-            result_check = await self.db.execute(stmt_check)
-            if result_check.scalar_one_or_none() is None:
-                break
+        while username in taken:
             username = f"{base_username}{counter}"
             counter += 1
         
@@ -78,19 +126,39 @@ class AuthService:
     
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        stmt = select(User).where(User.email == email)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(_GET_USER_BY_EMAIL, {"email": email})
         return result.scalar_one_or_none()
     
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        stmt = select(User).where(User.id == user_id)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        if user_id in self._user_cache:
+            return self._user_cache[user_id]
+        
+        result = await self.db.execute(_GET_USER_BY_ID, {"user_id": user_id})
+        user = result.scalar_one_or_none()
+        if user is not None:
+            self._user_cache[user_id] = user
+        return user
+    
+    async def get_authenticated_user(self, user_id: str) -> Optional[AuthenticatedUser]:
+        """Get user for request authentication, served from the shared short-lived cache"""
+        snapshot = _authenticated_user_cache.get(user_id)
+        if snapshot is None:
+            user = await self.get_user_by_id(user_id)
+            if user is None:
+                return None
+            snapshot = AuthenticatedUser.from_user(user)
+            _authenticated_user_cache[user_id] = snapshot
+        return snapshot
     
     async def get_all_users(self) -> List[User]:
-        """Get all users"""
-        stmt = select(User).order_by(User.created_at.desc())
+        """Get all users, loading only the columns the user listing renders"""
+        stmt = select(User).options(
+            load_only(
+                User.id, User.username, User.email, User.full_name, User.role,
+                User.is_active, User.created_at, User.updated_at
+            )
+        ).order_by(User.created_at.desc())
         result = await self.db.execute(stmt)
         return result.scalars().all()
     
@@ -101,15 +169,14 @@ class AuthService:
             return None
         
         # Update user fields
-        update_fields = {}
-        for field, value in user_data.dict(exclude_unset=True).items():
-            if value is not None:
-                setattr(user, field, value)
-                update_fields[field] = value
+        update_fields = user_data.model_dump(exclude_unset=True, exclude_none=True)
+        for field, value in update_fields.items():
+            setattr(user, field, value)
         
-        user.updated_at = datetime.utcnow()
         await self.db.commit()
         await self.db.refresh(user)
+        self._user_cache.pop(user_id, None)
+        _authenticated_user_cache.pop(user_id, None)
         
         # Log user update
         await self._log_action(
@@ -139,20 +206,19 @@ class AuthService:
         
         await self.db.delete(user)
         await self.db.commit()
+        self._user_cache.pop(user_id, None)
+        _authenticated_user_cache.pop(user_id, None)
         
         return True
     
     async def activate_user(self, user_id: str, activated_by: Optional[str] = None) -> Optional[User]:
         """Activate user account"""
-        user = await self.get_user_by_id(user_id)
+        stmt = update(User).where(User.id == user_id).values(is_active=True).returning(User)
+        result = await self.db.execute(stmt)
+        user = result.scalar_one_or_none()
         if not user:
             return None
         
-        user.is_active = True
-        user.updated_at = datetime.utcnow()
-        await self.db.commit()
-        await self.db.refresh(user)
-        
         # Log user activation
         await self._log_action(
             user_id=activated_by,
@@ -161,20 +227,19 @@ class AuthService:
             resource_id=user_id,
             details={"email": user.email}
         )
+        await self.db.commit()
+        _authenticated_user_cache.pop(user_id, None)
         
         return user
     
     async def deactivate_user(self, user_id: str, deactivated_by: Optional[str] = None) -> Optional[User]:
         """Deactivate user account"""
-        user = await self.get_user_by_id(user_id)
+        stmt = update(User).where(User.id == user_id).values(is_active=False).returning(User)
+        result = await self.db.execute(stmt)
+        user = result.scalar_one_or_none()
         if not user:
             return None
         
-        user.is_active = False
-        user.updated_at = datetime.utcnow()
-        await self.db.commit()
-        await self.db.refresh(user)
-        
         # Log user deactivation
         await self._log_action(
             user_id=deactivated_by,
@@ -183,20 +248,22 @@ class AuthService:
             resource_id=user_id,
             details={"email": user.email}
         )
+        await self.db.commit()
+        _authenticated_user_cache.pop(user_id, None)
         
         return user
     
     async def set_user_role(self, user_id: str, role: str, updated_by: Optional[str] = None) -> Optional[User]:
         """Set user role"""
-        user = await self.get_user_by_id(user_id)
-        if not user:
+        # The CTE reads the row before the UPDATE so the previous role is available for the audit log
+        prior = select(User.role).where(User.id == user_id).cte("prior_user")
+        stmt = update(User).where(User.id == user_id).values(role=role).returning(
+            User, select(prior.c.role).scalar_subquery().label("old_role")
+        )
+        row = (await self.db.execute(stmt)).one_or_none()
+        if row is None:
             return None
-        
-        old_role = user.role
-        user.role = role
-        user.updated_at = datetime.utcnow()
-        await self.db.commit()
-        await self.db.refresh(user)
+        user, old_role = row
         
         # Log role change
         await self._log_action(
@@ -206,6 +273,8 @@ class AuthService:
             resource_id=user_id,
             details={"old_role": old_role, "new_role": role, "email": user.email}
         )
+        await self.db.commit()
+        _authenticated_user_cache.pop(user_id, None)
         
         return user
     
@@ -214,14 +283,10 @@ class AuthService:
         """Authenticate user with email and password"""
         user = await self.get_user_by_email(email)
         if not user:
+            await AuthUtils.averify_password(password, _DUMMY_PASSWORD_HASH)
             logger.debug(f"auth.authenticate_user user_not_found email={email}")
             return None
-        # Quick length check before verify to avoid passlib size errors
-        if len(password.encode('utf-8')) > 72:
-            logger.debug(f"auth.authenticate_user password_too_long email={email} length={len(password)}")
-            return None
-        
-        if not AuthUtils.verify_password(password, user.hashed_password):
+        if not await AuthUtils.averify_password(password, user.hashed_password):
             logger.debug(f"auth.authenticate_user invalid_password email={email}")
             return None
         
@@ -235,14 +300,14 @@ class AuthService:
             return False
         
         # Verify current password
-        if not AuthUtils.verify_password(current_password, user.hashed_password):
+        if not await AuthUtils.averify_password(current_password, user.hashed_password):
             return False
         
         # Update password
-        user.hashed_password = AuthUtils.get_password_hash(new_password)
+        user.hashed_password = await AuthUtils.aget_password_hash(new_password)
         user.password_changed_at = datetime.utcnow()
-        user.updated_at = datetime.utcnow()
         await self.db.commit()
+        _authenticated_user_cache.pop(user_id, None)
         
         # Log password change
         await self._log_action(
@@ -290,8 +355,8 @@ class AuthService:
             return False
         
         refresh_token.is_active = False
-        refresh_token.updated_at = datetime.utcnow()
         await self.db.commit()
+        JWTManager.invalidate(token)
         
         return True
     
@@ -303,8 +368,7 @@ class AuthService:
                 RefreshToken.is_active == True
             )
         ).values(
-            is_active=False,
-            updated_at=datetime.utcnow()
+            is_active=False
         )
         
         await self.db.execute(stmt)
@@ -366,23 +430,61 @@ class AuthService:
         result = await self.db.execute(stmt)
         return result.scalars().all()
     
-    async def cleanup_expired_sessions(self) -> int:
-        """Clean up expired sessions"""
+    async def cleanup_expired_sessions(self, batch_size: int = 1000) -> int:
+        """Clean up expired sessions in bounded batches to keep lock times short"""
         expiry_time = datetime.utcnow() - timedelta(hours=24)
+        total = 0
         
-        stmt = update(UserSession).where(
-            and_(
-                UserSession.last_activity < expiry_time,
-                UserSession.ended_at.is_(None)
+        while True:
+            expired_ids = select(UserSession.id).where(
+                and_(
+                    UserSession.last_activity < expiry_time,
+                    UserSession.ended_at.is_(None)
+                )
+            ).limit(batch_size).with_for_update(skip_locked=True)
+            
+            stmt = update(UserSession).where(
+                UserSession.id.in_(expired_ids)
+            ).values(
+                ended_at=datetime.utcnow()
             )
-        ).values(
-            ended_at=datetime.utcnow()
-        )
+            
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            
+            if result.rowcount == 0:
+                break
+            total += result.rowcount
         
-        result = await self.db.execute(stmt)
-        await self.db.commit()
+        return total
+    
+    async def deactivate_expired_sessions(self, batch_size: int = 1000) -> int:
+        """Mark sessions past expires_at inactive with set-based UPDATEs, in bounded batches"""
+        now = datetime.utcnow()
+        total = 0
+        
+        while True:
+            expired_ids = select(UserSession.id).where(
+                and_(
+                    UserSession.expires_at < now,
+                    UserSession.is_active == True
+                )
+            ).limit(batch_size).with_for_update(skip_locked=True)
+            
+            stmt = update(UserSession).where(
+                UserSession.id.in_(expired_ids)
+            ).values(
+                is_active=False
+            )
+            
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            
+            if result.rowcount == 0:
+                break
+            total += result.rowcount
         
-        return result.rowcount
+        return total
     
     # Audit Logging
     async def _log_action(
@@ -401,7 +503,7 @@ class AuthService:
             action=action,
             resource=resource,
             resource_id=resource_id,
-            details=json.dumps(details) if details else None,
+            details=details or None,
             ip_address=ip_address,
             user_agent=user_agent
         )
@@ -446,15 +548,7 @@ class AuthService:
     # Permission Management
     def check_permission(self, user_role: str, required_permission: str) -> bool:
         """Check if user role has required permission"""
-        role_permissions = {
-            "admin": ["read", "write", "delete", "manage_users", "view_audit"],
-            "manager": ["read", "write", "manage_team"],
-            "employee": ["read", "write"],
-            "viewer": ["read"]
-        }
-        
-        permissions = role_permissions.get(user_role, [])
-        return required_permission in permissions
+        return required_permission in _ROLE_PERMISSIONS.get(user_role, frozenset())
     
     def check_resource_access(self, user_id: str, user_role: str, resource_id: str, action: str) -> bool:
         """Check if user can access specific resource"""
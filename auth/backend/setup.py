@@ -8,6 +8,7 @@ import asyncio
 import sys
 import os
 from pathlib import Path
+from uuid import uuid4
 
 # Add the auth module to the path
 auth_path = Path(__file__).parent
@@ -15,13 +16,14 @@ sys.path.insert(0, str(auth_path))
 
 try:
     from config import auth_settings
-    from database import async_engine, get_db, init_database_async
+    from database import async_engine, get_db, init_database_async, test_connection_async
     from service import AuthService
     from schemas import UserCreate
     from models import User
     from utils import AuthUtils
     from logging_config import setup_logging
     from sqlalchemy import text
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
     import logging
 except ImportError as e:
     print(f"Error importing modules: {e}")
@@ -44,47 +46,64 @@ async def create_tables():
         logger.error(f"[AUTH] Failed to create tables: {e}")
         return False
 
-async def create_default_admin():
-    """Create default admin user if none exists"""
+# Users created on first setup; extend this list to seed more accounts
+DEFAULT_SEED_USERS = [
+    {
+        "username": "admin",
+        "email": "admin@mg-erp.com",
+        "full_name": "System Administrator",
+        "password": "admin123",
+        "role": "admin",
+    },
+]
+
+async def create_seed_users(seed_list):
+    """Insert seed users in a single statement, skipping emails that already exist"""
     try:
-        # Get async database session
+        rows = [
+            {
+                "id": str(uuid4()),
+                "username": seed["username"],
+                "email": seed["email"],
+                "full_name": seed["full_name"],
+                "hashed_password": AuthUtils.get_password_hash(seed["password"]),
+                "role": seed["role"],
+                "is_active": True,
+            }
+            for seed in seed_list
+        ]
+        
+        stmt = (
+            pg_insert(User.__table__)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User.__table__.c.email)
+        )
+        
         async with async_engine.begin() as conn:
-            # Check if admin user exists
-            result = await conn.execute(
-                text("SELECT email FROM auth.users WHERE email = 'admin@mg-erp.com'")
-            )
-            admin_exists = result.fetchone()
+            result = await conn.execute(stmt)
+            created = {row.email for row in result}
+        
+        for seed in seed_list:
+            if seed["email"] not in created:
+                logger.info(f"User already exists: {seed['email']}")
+                print(f"User {seed['email']} already exists in the database")
+                continue
             
-            if not admin_exists:
-                # Hash the default password
-                hashed_password = AuthUtils.get_password_hash("admin123")
-                
-                # Insert admin user directly
-                await conn.execute(
-                    text("""
-                        INSERT INTO auth.users (id, username, email, full_name, hashed_password, role, is_active)
-                        VALUES (gen_random_uuid()::text, 'admin', 'admin@mg-erp.com', 'System Administrator', :password, 'admin', true)
-                    """),
-                    {"password": hashed_password}
-                )
-                
-                logger.info("[AUTH] Created default admin user: admin@mg-erp.com")
-                
-                print("\n" + "="*60)
-                print("DEFAULT ADMIN USER CREATED")
-                print("="*60)
-                print(f"Username: admin")
-                print(f"Password: admin123")
-                print(f"Email: admin@mg-erp.com")
-                print("\n⚠️  IMPORTANT: Change the default password after first login!")
-                print("="*60)
-            else:
-                logger.info("Admin user already exists")
-                print("Admin user already exists in the database")
+            logger.info(f"[AUTH] Created seed user: {seed['email']}")
+            
+            print("\n" + "="*60)
+            print(f"{seed['role'].upper()} USER CREATED")
+            print("="*60)
+            print(f"Username: {seed['username']}")
+            print(f"Password: {seed['password']}")
+            print(f"Email: {seed['email']}")
+            print("\n⚠️  IMPORTANT: Change the default password after first login!")
+            print("="*60)
         
         return True
     except Exception as e:
-        logger.error(f"Failed to create admin user: {e}")
+        logger.error(f"Failed to create seed users: {e}")
         return False
 
 async def verify_setup():
@@ -114,16 +133,13 @@ async def main():
     print("🚀 MG-ERP Authentication Service Setup")
     print("="*50)
     
-    # Check database connection
-    try:
-        print("📡 Testing database connection...")
-        # Initialize database (create schema and tables)
-        await init_database_async()
-        print("✅ Database connection successful")
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
+    # Check database connection (DDL is left to create_tables)
+    print("📡 Testing database connection...")
+    if not await test_connection_async():
+        print("❌ Database connection failed")
         print("\n🔧 Please check your database configuration in config.py")
         return False
+    print("✅ Database connection successful")
     
     # Create tables
     print("📋 Creating database tables...")
@@ -134,7 +150,7 @@ async def main():
     
     # Create default admin user
     print("👤 Setting up default admin user...")
-    if not await create_default_admin():
+    if not await create_seed_users(DEFAULT_SEED_USERS):
         print("❌ Failed to create admin user")
         return False
     
@@ -1,11 +1,24 @@
-from passlib.context import CryptContext
-from passlib.exc import PasswordSizeError
+from passlib.hash import pbkdf2_sha256
+import asyncio
+import base64
+import bcrypt
+import hashlib
+import hmac
 import logging
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import orjson
+import os
+import re
+import threading
+import time
+from cachetools import TTLCache
+import jwt
+from jwt import InvalidTokenError as JWTError
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, FrozenSet, List, Mapping
 import secrets
 import string
+from functools import lru_cache
+from types import MappingProxyType
 try:
     from .config import auth_settings
     from .schemas import TokenData
@@ -13,27 +26,73 @@ except ImportError:
     from config import auth_settings
     from schemas import TokenData
 
-# Password hashing context
-pwd_context = CryptContext(
-    schemes=["bcrypt", "pbkdf2_sha256"],  # include legacy/fallback scheme if existing hashes weren't bcrypt
-    deprecated="auto"
+# Read once; verify_password checks it on every call
+_DEBUG = auth_settings.DEBUG
+
+# Password hashing
+# New hashes are bcrypt over an HMAC-SHA256 pre-hash, written in passlib's bcrypt_sha256
+# v2 format so hashes issued earlier keep verifying; bcrypt is called directly instead of
+# through CryptContext. Plain bcrypt and pbkdf2_sha256 hashes are still accepted.
+_BCRYPT_ROUNDS = 11
+_BCRYPT_SHA256_PREFIX = "$bcrypt-sha256$"
+_BCRYPT_SHA256_RE = re.compile(
+    r"^\$bcrypt-sha256\$v=2,t=(2[aby]),r=(\d{1,2})\$([./A-Za-z0-9]{22})\$([./A-Za-z0-9]{31})$"
 )
 
+def _bcrypt_sha256_key(password: str, salt: bytes) -> bytes:
+    return base64.b64encode(hmac.new(salt, password.encode("utf-8"), hashlib.sha256).digest())
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# Fixed JOSE header for HS256 tokens, encoded once
+_HS256_HEADER = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+# Signing settings read once at import; the HMAC template is keyed here and copied per token
+_SECRET = auth_settings.SECRET_KEY.encode()
+_ALG = auth_settings.ALGORITHM
+_ACCESS_TTL_SECONDS = auth_settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TTL_SECONDS = auth_settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+_HS256_HMAC = hmac.new(_SECRET, digestmod=hashlib.sha256)
+
+# Decoded tokens keyed by (token, token_type); entries hold their own expiry
+# so a cached token never outlives its exp claim
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=60)
+_TOKEN_CACHE_LOCK = threading.Lock()
+_TOKEN_CACHE_TTL = 60
+_INVALID_TOKEN_TTL = 5
+_INVALID_TOKEN = object()
+
+# bcrypt is CPU-bound but releases the GIL; run it in threads so logins don't block
+# the event loop, bounded so a login storm can't spawn unbounded worker threads
+_BCRYPT_SEM = asyncio.Semaphore((os.cpu_count() or 1) * 2)
+
 class AuthUtils:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a plain password against its hash"""
         try:
-            result = pwd_context.verify(plain_password, hashed_password)
+            if hashed_password.startswith(_BCRYPT_SHA256_PREFIX):
+                match = _BCRYPT_SHA256_RE.match(hashed_password)
+                if match is None:
+                    return False
+                ident, rounds, salt, digest = match.groups()
+                config = f"${ident}${int(rounds):02d}${salt}".encode()
+                key = _bcrypt_sha256_key(plain_password, salt.encode())
+                result = bcrypt.checkpw(key, config + digest.encode())
+            elif hashed_password.startswith("$2"):
+                # Legacy plain bcrypt hashes; bcrypt only ever saw the first 72 bytes
+                result = bcrypt.checkpw(plain_password.encode("utf-8")[:72], hashed_password.encode())
+            elif hashed_password.startswith("$pbkdf2-sha256$"):
+                result = pbkdf2_sha256.verify(plain_password, hashed_password)
+            else:
+                result = False
             return result
-        except PasswordSizeError:
-            return False
         except ValueError:
             return False
         finally:
             # Optional diagnostic logging when DEBUG enabled
-            from .config import auth_settings  # local import to avoid circular issues
-            if auth_settings.DEBUG:
+            if _DEBUG:
                 logger = logging.getLogger(__name__)
                 prefix = hashed_password.split('$')[1] if '$' in hashed_password else 'unknown'
                 logger.debug(f"auth.password.verify debug prefix={prefix} length={len(plain_password)} valid={result if 'result' in locals() else False}")
@@ -41,16 +100,34 @@ class AuthUtils:
     @staticmethod
     def get_password_hash(password: str) -> str:
         """Hash a password"""
-        if len(password.encode('utf-8')) > 72:
-            # Explicitly guard before bcrypt truncation
-            raise ValueError("Password too long (max 72 characters for bcrypt)")
-        return pwd_context.hash(password)
+        config = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+        salt = config[-22:]
+        hashed = bcrypt.hashpw(_bcrypt_sha256_key(password, salt), config)
+        return f"{_BCRYPT_SHA256_PREFIX}v=2,t=2b,r={_BCRYPT_ROUNDS}${salt.decode()}${hashed[-31:].decode()}"
+    
+    @staticmethod
+    async def averify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password in a worker thread"""
+        async with _BCRYPT_SEM:
+            return await asyncio.to_thread(AuthUtils.verify_password, plain_password, hashed_password)
+    
+    @staticmethod
+    async def aget_password_hash(password: str) -> str:
+        """Hash a password in a worker thread"""
+        async with _BCRYPT_SEM:
+            return await asyncio.to_thread(AuthUtils.get_password_hash, password)
     
     @staticmethod
     def generate_random_password(length: int = 12) -> str:
         """Generate a random password"""
         alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-        return ''.join(secrets.choice(alphabet) for _ in range(length))
+        # One urandom draw per batch instead of one per character; bytes at or above
+        # the largest multiple of len(alphabet) are rejected to keep the mapping unbiased
+        limit = 256 - 256 % len(alphabet)
+        chars: list = []
+        while len(chars) < length:
+            chars.extend(alphabet[b % len(alphabet)] for b in os.urandom(length * 2) if b < limit)
+        return ''.join(chars[:length])
     
     @staticmethod
     def validate_password_strength(password: str) -> tuple[bool, str]:
@@ -58,12 +135,19 @@ class AuthUtils:
         if len(password) < auth_settings.MIN_PASSWORD_LENGTH:
             return False, f"Password must be at least {auth_settings.MIN_PASSWORD_LENGTH} characters long"
         
-        has_upper = any(c.isupper() for c in password)
-        has_lower = any(c.islower() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_special = any(c in "!@#$%^&*()_+-=[]{}|;:,.<>?" for c in password)
+        # Classify each character once and stop as soon as every class has been seen
+        flags = 0
+        for c in password:
+            if c.isupper():
+                flags |= 1
+            elif c.islower():
+                flags |= 2
+            elif c.isdigit():
+                flags |= 4
+            if flags == 7:
+                break
         
-        if not (has_upper and has_lower and has_digit):
+        if flags != 7:
             return False, "Password must contain uppercase, lowercase, and numeric characters"
         
         return True, "Password is strong"
@@ -74,17 +158,19 @@ class JWTManager:
         """Create JWT access token"""
         to_encode = data.copy()
         
+        # Integer epoch exp; no datetime round-trip inside the JWT library
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(minutes=auth_settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+            expire = now + _ACCESS_TTL_SECONDS
         
         to_encode.update({"exp": expire, "type": "access"})
         
         encoded_jwt = jwt.encode(
             to_encode, 
-            auth_settings.SECRET_KEY, 
-            algorithm=auth_settings.ALGORITHM
+            _SECRET, 
+            algorithm=_ALG
         )
         return encoded_jwt
     
@@ -93,51 +179,85 @@ class JWTManager:
         """Create JWT refresh token"""
         to_encode = data.copy()
         
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(days=auth_settings.REFRESH_TOKEN_EXPIRE_DAYS)
+            expire = now + _REFRESH_TTL_SECONDS
         
         to_encode.update({"exp": expire, "type": "refresh"})
+        if _ALG != "HS256":
+            return jwt.encode(
+                to_encode, 
+                _SECRET, 
+                algorithm=_ALG
+            )
         
-        encoded_jwt = jwt.encode(
-            to_encode, 
-            auth_settings.SECRET_KEY, 
-            algorithm=auth_settings.ALGORITHM
-        )
-        return encoded_jwt
+        # Issued on every login: sign directly with hashlib (OpenSSL) and orjson
+        # rather than going through PyJWT's generic encode path
+        signing_input = _HS256_HEADER + b"." + _b64url(orjson.dumps(to_encode))
+        mac = _HS256_HMAC.copy()
+        mac.update(signing_input)
+        signature = mac.digest()
+        return (signing_input + b"." + _b64url(signature)).decode()
     
     @staticmethod
     def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
-        """Verify and decode JWT token"""
+        """Verify and decode JWT token, reusing recent results for the same token"""
+        key = (token, token_type)
+        now = time.time()
+        with _TOKEN_CACHE_LOCK:
+            cached = _TOKEN_CACHE.get(key)
+        if cached is not None and cached[0] > now:
+            return None if cached[1] is _INVALID_TOKEN else cached[1]
+        
         try:
             payload = jwt.decode(
                 token, 
-                auth_settings.SECRET_KEY, 
-                algorithms=[auth_settings.ALGORITHM]
-            )
-            
-            # Check token type
-            if payload.get("type") != token_type:
-                return None
-            
-            # Try both 'user_id' and 'sub' for backward compatibility
-            user_id: str = payload.get("user_id") or payload.get("sub")
-            username: str = payload.get("username")
-            role: str = payload.get("role")
-            permissions: list = payload.get("permissions", [])
-            
-            if user_id is None:
-                return None
-            
-            return TokenData(
-                user_id=user_id,
-                username=username,
-                role=role,
-                permissions=permissions
+                _SECRET, 
+                algorithms=[_ALG]
             )
         except JWTError:
+            payload = None
+        
+        token_data = JWTManager._token_data_from_payload(payload, token_type) if payload else None
+        if token_data is None:
+            # Short negative entry absorbs repeated replays of a bad token
+            entry = (now + _INVALID_TOKEN_TTL, _INVALID_TOKEN)
+        else:
+            entry = (min(now + _TOKEN_CACHE_TTL, payload.get("exp", now)), token_data)
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[key] = entry
+        return token_data
+    
+    @staticmethod
+    def _token_data_from_payload(payload: Dict[str, Any], token_type: str) -> Optional[TokenData]:
+        # Check token type
+        if not hmac.compare_digest(str(payload.get("type", "")), token_type):
+            return None
+        
+        # Try both 'user_id' and 'sub' for backward compatibility
+        user_id: str = payload.get("user_id") or payload.get("sub")
+        username: str = payload.get("username")
+        role: str = payload.get("role")
+        permissions: list = payload.get("permissions", [])
+        
+        if user_id is None:
             return None
+        
+        return TokenData(
+            user_id=user_id,
+            username=username,
+            role=role,
+            permissions=permissions
+        )
+    
+    @staticmethod
+    def invalidate(token: str) -> None:
+        """Drop any cached verification result for a token (e.g. on logout)"""
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE.pop((token, "access"), None)
+            _TOKEN_CACHE.pop((token, "refresh"), None)
     
     @staticmethod
     def verify_refresh_token(token: str) -> Optional[TokenData]:
@@ -150,13 +270,13 @@ class JWTManager:
         try:
             payload = jwt.decode(
                 token, 
-                auth_settings.SECRET_KEY, 
-                algorithms=[auth_settings.ALGORITHM],
+                _SECRET, 
+                algorithms=[_ALG],
                 options={"verify_exp": False}
             )
             exp_timestamp = payload.get("exp")
             if exp_timestamp:
-                return datetime.utcfromtimestamp(exp_timestamp)
+                return datetime.fromtimestamp(exp_timestamp, tz=timezone.utc)
         except JWTError:
             pass
         return None
@@ -211,9 +331,7 @@ class PermissionManager:
     @classmethod
     def check_permission(cls, user_role: str, module: str, action: str) -> bool:
         """Check if user role has permission for action on module"""
-        role_perms = cls.ROLE_PERMISSIONS.get(user_role, {})
-        module_perms = role_perms.get(module, [])
-        return action in module_perms
+        return _check_permission(user_role, module, action)
     
     @classmethod
     def get_user_permissions(cls, user_role: str) -> Dict[str, list]:
@@ -225,11 +343,55 @@ class PermissionManager:
         """Get permissions for specific module"""
         role_perms = cls.ROLE_PERMISSIONS.get(user_role, {})
         return role_perms.get(module, [])
+    
+    @classmethod
+    def get_permission_claims(cls, user_role: str) -> List[str]:
+        """Get the flattened "module:action" permissions embedded in access tokens"""
+        return _ROLE_CLAIMS.get(user_role, [])
+    
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Rebuild cached role lookups after ROLE_PERMISSIONS has been changed"""
+        _build_role_caches()
+
+_NO_PERMS: FrozenSet[str] = frozenset()
+
+@lru_cache(maxsize=None)
+def _role_perms(role: str) -> Mapping[str, FrozenSet[str]]:
+    """Immutable module -> actions view of a role, built once per role"""
+    return MappingProxyType({
+        module: frozenset(actions)
+        for module, actions in PermissionManager.ROLE_PERMISSIONS.get(role, {}).items()
+    })
+
+@lru_cache(maxsize=1024)
+def _check_permission(role: str, module: str, action: str) -> bool:
+    """Memoized check outcome; permissions derive from the role alone, so it is the key"""
+    return action in _role_perms(role).get(module, _NO_PERMS)
+
+# Flattened "module:action" permission set per role
+_ROLE_CACHE: Dict[str, FrozenSet[str]] = {}
+_ROLE_CLAIMS: Dict[str, List[str]] = {}
+
+def _build_role_caches() -> None:
+    """(Re)build every derived role lookup from PermissionManager.ROLE_PERMISSIONS"""
+    _role_perms.cache_clear()
+    _check_permission.cache_clear()
+    _ROLE_CACHE.clear()
+    _ROLE_CLAIMS.clear()
+    for role, perms in PermissionManager.ROLE_PERMISSIONS.items():
+        _role_perms(role)
+        _ROLE_CACHE[role] = frozenset(
+            f"{module}:{action}" for module, actions in perms.items() for action in actions
+        )
+        _ROLE_CLAIMS[role] = sorted(_ROLE_CACHE[role])
+
+_build_role_caches()
 
 # Utility functions for common auth operations
 def create_user_tokens(user_id: str, username: str, role: str) -> Dict[str, Any]:
     """Create both access and refresh tokens for a user"""
-    permissions = PermissionManager.get_user_permissions(role)
+    permissions = PermissionManager.get_permission_claims(role)
     
     token_data = {
         "sub": user_id,
@@ -1,17 +1,16 @@
 """
 Add sample brands and suppliers
 """
+import asyncio
 import logging
-from sqlalchemy import create_engine, text
-from app.config import settings
+from sqlalchemy import text
+from app.database import async_engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def add_sample_data():
+async def add_sample_data():
     """Add sample brands and suppliers for testing"""
-    engine = create_engine(settings.DATABASE_URL.replace("+asyncpg", ""))
-    
     brands = [
         ("Hugo Boss", "Premium German luxury fashion brand"),
         ("Calvin Klein", "American luxury fashion house"),
@@ -26,56 +25,56 @@ def add_sample_data():
         ("Elite Garments Inc", "Mike Wilson", "mike@elitegarments.com", "555-123-4567", "789 Industry Blvd, Chicago", 10)
     ]
     
-    with engine.begin() as conn:
+    async with async_engine.begin() as conn:
         try:
             logger.info("🏷️ Adding sample brands...")
             
-            for name, description in brands:
-                # Check if brand already exists
-                result = conn.execute(text("SELECT id FROM inventory.brands WHERE name = :name"), {"name": name})
-                existing = result.fetchone()
-                
-                if existing:
+            # One statement for all brands; names that already exist are skipped
+            result = await conn.execute(text("""
+                INSERT INTO inventory.brands (id, name, description)
+                SELECT gen_random_uuid()::text, b.name, b.description
+                FROM unnest(CAST(:names AS text[]), CAST(:descriptions AS text[])) AS b(name, description)
+                ON CONFLICT (name) DO NOTHING
+                RETURNING id, name
+            """), {
+                "names": [name for name, _ in brands],
+                "descriptions": [description for _, description in brands],
+            })
+            
+            created = {name: brand_id for brand_id, name in result}
+            for name, _ in brands:
+                if name in created:
+                    logger.info(f"✅ Created brand: {name} (ID: {created[name]})")
+                else:
                     logger.info(f"✅ Brand '{name}' already exists")
-                    continue
-                
-                # Insert new brand
-                result = conn.execute(text("""
-                    INSERT INTO inventory.brands (id, name, description) 
-                    VALUES (gen_random_uuid()::text, :name, :description)
-                    RETURNING id, name
-                """), {"name": name, "description": description})
-                
-                brand = result.fetchone()
-                logger.info(f"✅ Created brand: {brand[1]} (ID: {brand[0]})")
             
             logger.info("🚚 Adding sample suppliers...")
             
-            for name, contact_person, email, phone, address, lead_time in suppliers:
-                # Check if supplier already exists
-                result = conn.execute(text("SELECT id FROM inventory.suppliers WHERE name = :name"), {"name": name})
-                existing = result.fetchone()
-                
-                if existing:
+            # suppliers.name has no unique constraint, so skip existing names explicitly
+            result = await conn.execute(text("""
+                INSERT INTO inventory.suppliers (id, name, contact_person, email, phone, address, lead_time_days)
+                SELECT gen_random_uuid()::text, s.name, s.contact_person, s.email, s.phone, s.address, s.lead_time
+                FROM unnest(
+                    CAST(:names AS text[]), CAST(:contact_persons AS text[]), CAST(:emails AS text[]),
+                    CAST(:phones AS text[]), CAST(:addresses AS text[]), CAST(:lead_times AS integer[])
+                ) AS s(name, contact_person, email, phone, address, lead_time)
+                WHERE NOT EXISTS (SELECT 1 FROM inventory.suppliers existing WHERE existing.name = s.name)
+                RETURNING id, name
+            """), {
+                "names": [row[0] for row in suppliers],
+                "contact_persons": [row[1] for row in suppliers],
+                "emails": [row[2] for row in suppliers],
+                "phones": [row[3] for row in suppliers],
+                "addresses": [row[4] for row in suppliers],
+                "lead_times": [row[5] for row in suppliers],
+            })
+            
+            created = {name: supplier_id for supplier_id, name in result}
+            for name, *_ in suppliers:
+                if name in created:
+                    logger.info(f"✅ Created supplier: {name} (ID: {created[name]})")
+                else:
                     logger.info(f"✅ Supplier '{name}' already exists")
-                    continue
-                
-                # Insert new supplier
-                result = conn.execute(text("""
-                    INSERT INTO inventory.suppliers (id, name, contact_person, email, phone, address, lead_time_days) 
-                    VALUES (gen_random_uuid()::text, :name, :contact_person, :email, :phone, :address, :lead_time)
-                    RETURNING id, name
-                """), {
-                    "name": name, 
-                    "contact_person": contact_person, 
-                    "email": email, 
-                    "phone": phone, 
-                    "address": address, 
-                    "lead_time": lead_time
-                })
-                
-                supplier = result.fetchone()
-                logger.info(f"✅ Created supplier: {supplier[1]} (ID: {supplier[0]})")
             
             logger.info("🎉 Sample data setup completed!")
             
@@ -84,4 +83,4 @@ def add_sample_data():
             raise
 
 if __name__ == "__main__":
-    add_sample_data()
\ No newline at end of file
+    asyncio.run(add_sample_data())
\ No newline at end of file
@@ -1,47 +1,49 @@
 """
 Add multiple sample categories
 """
+import asyncio
 import logging
-from sqlalchemy import create_engine, text
-from app.config import settings
+from sqlalchemy import text
+from app.database import async_engine
+from app.models.inventory_models import SizeType
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def add_sample_categories():
+async def add_sample_categories():
     """Add multiple sample categories for testing"""
-    engine = create_engine(settings.DATABASE_URL.replace("+asyncpg", ""))
-    
     categories = [
-        ("Formal Shirts", "Business and formal dress shirts", "clothing"),
-        ("Casual Pants", "Jeans and casual trousers", "numeric"),
-        ("Dress Shoes", "Formal footwear", "shoe"),
-        ("Suits & Blazers", "Formal suits and blazers", "clothing"),
-        ("Accessories", "Ties, belts, and other accessories", "clothing")
+        ("Formal Shirts", "Business and formal dress shirts", SizeType.CLOTHING.value),
+        ("Casual Pants", "Jeans and casual trousers", SizeType.NUMERIC.value),
+        ("Dress Shoes", "Formal footwear", SizeType.SHOE.value),
+        ("Suits & Blazers", "Formal suits and blazers", SizeType.CLOTHING.value),
+        ("Accessories", "Ties, belts, and other accessories", SizeType.CLOTHING.value)
     ]
     
-    with engine.begin() as conn:
+    async with async_engine.begin() as conn:
         try:
             logger.info("📦 Adding sample categories...")
             
-            for name, description, size_type in categories:
-                # Check if category already exists
-                result = conn.execute(text("SELECT id FROM inventory.categories WHERE name = :name"), {"name": name})
-                existing = result.fetchone()
-                
-                if existing:
+            # One statement for all categories; names that already exist are skipped
+            result = await conn.execute(text("""
+                INSERT INTO inventory.categories (id, name, description, size_type)
+                SELECT gen_random_uuid()::text, c.name, c.description, c.size_type::inventory.sizetype
+                FROM unnest(CAST(:names AS text[]), CAST(:descriptions AS text[]), CAST(:size_types AS text[]))
+                    AS c(name, description, size_type)
+                ON CONFLICT (name) DO NOTHING
+                RETURNING id, name
+            """), {
+                "names": [row[0] for row in categories],
+                "descriptions": [row[1] for row in categories],
+                "size_types": [row[2] for row in categories],
+            })
+            
+            created = {name: category_id for category_id, name in result}
+            for name, *_ in categories:
+                if name in created:
+                    logger.info(f"✅ Created category: {name} (ID: {created[name]})")
+                else:
                     logger.info(f"✅ Category '{name}' already exists")
-                    continue
-                
-                # Insert new category
-                result = conn.execute(text("""
-                    INSERT INTO inventory.categories (id, name, description, size_type) 
-                    VALUES (gen_random_uuid()::text, :name, :description, :size_type)
-                    RETURNING id, name
-                """), {"name": name, "description": description, "size_type": size_type})
-                
-                category = result.fetchone()
-                logger.info(f"✅ Created category: {category[1]} (ID: {category[0]})")
             
             logger.info("🎉 Sample categories setup completed!")
             
@@ -50,4 +52,4 @@ def add_sample_categories():
             raise
 
 if __name__ == "__main__":
-    add_sample_categories()
\ No newline at end of file
+    asyncio.run(add_sample_categories())
\ No newline at end of file
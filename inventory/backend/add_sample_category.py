@@ -1,50 +1,43 @@
 """
 Add sample category to the database
 """
+import asyncio
 import logging
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.config import settings
-from app.models.inventory_models import Category, SizeType
+from sqlalchemy import text
+from app.database import async_engine
+from app.models.inventory_models import SizeType
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def add_sample_category():
+async def add_sample_category():
     """Add a sample category to test the system"""
-    engine = create_engine(settings.DATABASE_URL.replace("+asyncpg", ""))
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
-    db = SessionLocal()
-    try:
-        logger.info("📦 Adding sample category...")
-        
-        # Check if category already exists
-        existing = db.query(Category).filter(Category.name == "Test Shirts").first()
-        if existing:
-            logger.info("✅ Sample category 'Test Shirts' already exists")
-            return existing
-        
-        # Create new category
-        category = Category(
-            name="Test Shirts",
-            description="Sample category for testing - dress shirts and casual shirts",
-            size_type=SizeType.CLOTHING  # Use the enum directly, not .value
-        )
-        
-        db.add(category)
-        db.commit()
-        db.refresh(category)
-        
-        logger.info(f"✅ Successfully created sample category: {category.name} (ID: {category.id})")
-        return category
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to create sample category: {str(e)}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    async with async_engine.begin() as conn:
+        try:
+            logger.info("📦 Adding sample category...")
+            
+            # One round-trip: the insert is skipped if the name already exists
+            result = await conn.execute(text("""
+                INSERT INTO inventory.categories (id, name, description, size_type)
+                VALUES (gen_random_uuid()::text, :name, :description, CAST(:size_type AS inventory.sizetype))
+                ON CONFLICT (name) DO NOTHING
+                RETURNING id
+            """), {
+                "name": "Test Shirts",
+                "description": "Sample category for testing - dress shirts and casual shirts",
+                "size_type": SizeType.CLOTHING.value,
+            })
+            
+            category_id = result.scalar()
+            if category_id is None:
+                logger.info("✅ Sample category 'Test Shirts' already exists")
+            else:
+                logger.info(f"✅ Successfully created sample category: Test Shirts (ID: {category_id})")
+            return category_id
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to create sample category: {str(e)}")
+            raise
 
 if __name__ == "__main__":
-    add_sample_category()
\ No newline at end of file
+    asyncio.run(add_sample_category())
@@ -1,59 +1,36 @@
 """
 Add missing size_type column to categories table
 """
+import asyncio
 import logging
-from sqlalchemy import create_engine, text
-from app.config import settings
+from sqlalchemy import text
+from app.database import async_engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def add_size_type_column():
+async def add_size_type_column():
     """Add the missing size_type column to categories table"""
-    engine = create_engine(settings.DATABASE_URL.replace("+asyncpg", ""))
-    
-    with engine.begin() as conn:
+    async with async_engine.begin() as conn:
         try:
             logger.info("🔧 Adding missing size_type column...")
             
-            # First, create the enum type if it doesn't exist
-            conn.execute(text("""
+            # One round-trip: create the enum unless it exists, then add the column if missing;
+            # the DEFAULT fills existing rows when the column is added
+            await conn.execute(text("""
                 DO $$ 
                 BEGIN
-                    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'sizetype') THEN
+                    BEGIN
                         CREATE TYPE inventory.sizetype AS ENUM ('CLOTHING', 'NUMERIC', 'SHOE');
-                    END IF;
+                    EXCEPTION
+                        WHEN duplicate_object THEN NULL;
+                    END;
+                    
+                    ALTER TABLE inventory.categories 
+                    ADD COLUMN IF NOT EXISTS size_type inventory.sizetype DEFAULT 'CLOTHING';
                 END $$;
             """))
-            logger.info("✅ Ensured sizetype enum exists")
-            
-            # Check if the column already exists
-            result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_schema = 'inventory' 
-                AND table_name = 'categories' 
-                AND column_name = 'size_type'
-            """))
-            
-            if result.fetchone():
-                logger.info("✅ size_type column already exists")
-                return
-            
-            # Add the size_type column
-            conn.execute(text("""
-                ALTER TABLE inventory.categories 
-                ADD COLUMN size_type inventory.sizetype DEFAULT 'CLOTHING'
-            """))
-            logger.info("✅ Added size_type column to categories table")
-            
-            # Update existing rows to have a default value
-            conn.execute(text("""
-                UPDATE inventory.categories 
-                SET size_type = 'CLOTHING' 
-                WHERE size_type IS NULL
-            """))
-            logger.info("✅ Updated existing categories with default size_type")
+            logger.info("✅ size_type column is in place")
             
             logger.info("🎉 Size type column addition completed!")
             
@@ -62,4 +39,4 @@ def add_size_type_column():
             raise
 
 if __name__ == "__main__":
-    add_size_type_column()
\ No newline at end of file
+    asyncio.run(add_size_type_column())
@@ -1,23 +1,22 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from .models.inventory_models import Base
 from .config import settings
 
-# Create both sync and async engines
-engine = create_engine(settings.DATABASE_URL.replace("+asyncpg", ""))  # Sync engine for initial setup
-async_engine = create_async_engine(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    settings.DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
-def get_database():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 async def get_async_database():
     async with AsyncSessionLocal() as session:
         yield session
@@ -34,26 +33,7 @@ async def create_schema_and_tables():
         await conn.execute(text("GRANT ALL ON SCHEMA inventory TO mguser;"))
         logger.info("[SUCCESS] Inventory schema created or already exists")
         
-        # Create enum types first
-        logger.info("[ENUM] Creating sizetype enum...")
-        await conn.execute(text("""
-            DO $$ 
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM pg_type t 
-                    JOIN pg_namespace n ON t.typnamespace = n.oid 
-                    WHERE t.typname = 'sizetype' AND n.nspname = 'inventory'
-                ) THEN
-                    CREATE TYPE inventory.sizetype AS ENUM ('CLOTHING', 'NUMERIC', 'SHOE');
-                    RAISE NOTICE 'Created inventory.sizetype enum';
-                ELSE
-                    RAISE NOTICE 'inventory.sizetype enum already exists';
-                END IF;
-            END $$;
-        """))
-        logger.info("[SUCCESS] Sizetype enum processed")
-        
-        # Create tables
+        # Create tables; create_all also creates the inventory.sizetype enum if it's missing
         logger.info("[TABLES] Creating inventory tables...")
         await conn.run_sync(Base.metadata.create_all)
         logger.info("[SUCCESS] Inventory tables created")
@@ -62,6 +42,19 @@ async def create_schema_and_tables():
         await conn.execute(text("GRANT ALL ON ALL TABLES IN SCHEMA inventory TO mguser;"))
         await conn.execute(text("GRANT ALL ON ALL SEQUENCES IN SCHEMA inventory TO mguser;"))
 
-def create_tables():
-    """Legacy sync table creation - use create_schema_and_tables() instead"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+async def warm_connection_pools():
+    """Open every pooled connection up front so the first requests don't wait on connecting"""
+    results = await asyncio.gather(
+        *(async_engine.connect() for _ in range(settings.DB_POOL_SIZE)),
+        return_exceptions=True,
+    )
+    # Return every connection that did open before reporting a failure, so none stay checked out
+    await asyncio.gather(*(conn.close() for conn in results if isinstance(conn, AsyncConnection)))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+async def create_tables():
+    """Create tables only - use create_schema_and_tables() to also set up the schema and enum"""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
@@ -2,76 +2,117 @@ import httpx
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
+from cachetools import TTLCache
+from jose import jwt, JWTError
+import hashlib
 import logging
 import asyncio
+import time
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
-AUTH_SERVICE_URL = f"{settings.AUTH_SERVICE_URL}/api/v1/auth/profile"
+AUTH_PROFILE_PATH = "/api/v1/auth/profile"
 security = HTTPBearer()
 
+# One client for the whole process so requests reuse keep-alive connections
+# to the auth service; closed on application shutdown.
+AUTH_CLIENT = httpx.AsyncClient(
+    base_url=settings.AUTH_SERVICE_URL,
+    timeout=5.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0),
+)
+
+# Inventory actions allowed per role for check_permission, built once
+_ROLE_PERMISSIONS = {
+    "admin": frozenset({"create", "read", "update", "delete", "manage"}),
+    "manager": frozenset({"create", "read", "update", "delete"}),
+    "employee": frozenset({"read", "update"}),
+    "viewer": frozenset({"read"}),
+}
+
+# Users the auth service recently accepted, keyed by a digest of the token (raw
+# tokens are never stored). Entries last at most AUTH_CACHE_TTL seconds and never
+# outlive the token's own exp claim; a revoked token can stay usable for that long.
+AUTH_CACHE_TTL = 60
+_auth_cache = TTLCache(maxsize=10_000, ttl=AUTH_CACHE_TTL)
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def get_cached_user(token: str) -> Optional[dict]:
+    """Return the user for a token the auth service accepted recently, if any."""
+    entry = _auth_cache.get(_token_key(token))
+    if entry is None:
+        return None
+    user, expires_at = entry
+    if expires_at <= time.monotonic():
+        return None
+    return user
+
+def cache_user(token: str, user: dict):
+    """Remember an accepted token's user, no longer than the token itself is valid."""
+    lifetime = AUTH_CACHE_TTL
+    try:
+        # Only used to bound the cache entry; the auth service did the verification
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        exp = None
+    if exp is not None:
+        lifetime = min(lifetime, exp - time.time())
+    if lifetime > 0:
+        _auth_cache[_token_key(token)] = (user, time.monotonic() + lifetime)
+
+async def warm_auth_client():
+    """Open a keep-alive connection to the auth service so the first request doesn't pay for it."""
+    try:
+        await AUTH_CLIENT.get("/health")
+    except httpx.RequestError as e:
+        logger.warning(f"Auth service not reachable yet: {e}")
+
 async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """
     Validate JWT token with the centralized auth service and return user info.
     Raises HTTP 401 if token is invalid or user is not active.
     """
+    # AuthMiddleware has already validated this request's token
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
+    
     token = credentials.credentials
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                AUTH_SERVICE_URL,
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=5.0
-            )
-            if response.status_code != 200:
-                logger.warning(f"Auth service returned {response.status_code}: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired token"
-                )
-            user = response.json()
-            if not user.get("is_active", False):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User account is inactive"
-                )
-            logger.info(f"User authenticated: {user.get('email')}")
-            return user
-        except httpx.RequestError as e:
-            logger.error(f"Auth service unavailable: {e}")
+    user = get_cached_user(token)
+    if user is not None:
+        return user
+    try:
+        response = await AUTH_CLIENT.get(
+            AUTH_PROFILE_PATH,
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response.status_code != 200:
+            logger.warning(f"Auth service returned {response.status_code}: {response.text}")
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Auth service unavailable"
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token"
             )
-        except Exception as e:
-            logger.error(f"Authentication failed: {e}")
+        user = response.json()
+        if not user.get("is_active", False):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Authentication failed: {str(e)}"
+                detail="User account is inactive"
             )
-
-# Sync wrapper for compatibility with existing sync routes
-def require_auth():
-    """
-    Sync dependency that validates auth token.
-    This is a simplified version for existing sync routes.
-    """
-    async def auth_dependency(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-        return await get_current_user(request, credentials)
-    
-    return auth_dependency
+        logger.info(f"User authenticated: {user.get('email')}")
+        cache_user(token, user)
+        return user
+    except httpx.RequestError as e:
+        logger.error(f"Auth service unavailable: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Auth service unavailable"
+        )
 
 def check_permission(user_role: str, required_action: str) -> bool:
     """
     Check if user role has permission for the required action.
     """
-    role_permissions = {
-        "admin": ["create", "read", "update", "delete", "manage"],
-        "manager": ["create", "read", "update", "delete"],
-        "employee": ["read", "update"],
-        "viewer": ["read"]
-    }
-    
-    user_permissions = role_permissions.get(user_role, [])
-    return required_action in user_permissions
\ No newline at end of file
+    return required_action in _ROLE_PERMISSIONS.get(user_role, frozenset())
\ No newline at end of file
@@ -2,8 +2,12 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from .routes.inventory_routes import router as inventory_router
-from .database import create_schema_and_tables
+from .database import async_engine, create_schema_and_tables, warm_connection_pools
 from .init_data import create_sample_data
+from .config import settings
+from .external_auth import AUTH_CLIENT, AUTH_PROFILE_PATH, get_cached_user, cache_user, warm_auth_client
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 import traceback
@@ -19,10 +23,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan manager"""
+    # Startup: schema setup, DB pool warmup and the auth-service connection run concurrently
+    logger.info("[STARTUP] Starting Inventory Management System...")
+    schema_result, pool_result, _ = await asyncio.gather(
+        create_schema_and_tables(),
+        warm_connection_pools(),
+        warm_auth_client(),
+        return_exceptions=True,
+    )
+    try:
+        if isinstance(schema_result, Exception):
+            raise schema_result
+        logger.info("[SUCCESS] Inventory schema and tables created successfully")
+        
+        if settings.SEED_SAMPLE_DATA:
+            await create_sample_data()
+        
+        if isinstance(pool_result, Exception):
+            raise pool_result
+        logger.info("[SUCCESS] Database connection pools warmed")
+        
+    except Exception as e:
+        logger.error(f"[ERROR] Failed to initialize inventory database: {str(e)}")
+        # Don't raise here - let the server start anyway
+        logger.warning("[WARNING] Server starting with database issues - some features may not work")
+    
+    yield
+    
+    # Shutdown
+    await AUTH_CLIENT.aclose()
+    await async_engine.dispose()
+
 app = FastAPI(
     title="MG-ERP Inventory Management System",
     description="Inventory management microservice for menswear shop with inventory schema",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware - must be added BEFORE other middleware
@@ -78,11 +117,12 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 app.add_middleware(LoggingMiddleware)
 
 # Authentication middleware
+PUBLIC_PATHS = ("/docs", "/redoc", "/openapi.json", "/health")
+
 class AuthMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        # Skip auth for docs, health checks, and CORS preflight
-        public_paths = ["/docs", "/redoc", "/openapi.json", "/health"]
-        if any(request.url.path.startswith(path) for path in public_paths) or request.method == "OPTIONS":
+        # Skip auth for CORS preflight, docs and health checks
+        if request.method == "OPTIONS" or request.url.path.startswith(PUBLIC_PATHS):
             return await call_next(request)
         
         # Check for Authorization header
@@ -94,17 +134,15 @@ class AuthMiddleware(BaseHTTPMiddleware):
             )
         
         try:
-            # Validate token with auth service
-            import httpx
-            from .config import settings
             token = auth_header.split(" ")[1]
             
-            auth_url = f"{settings.AUTH_SERVICE_URL}/api/v1/auth/profile"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    auth_url,
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=5.0
+            # Tokens accepted within the cache window skip the auth service
+            user = get_cached_user(token)
+            if user is None:
+                # Validate token with auth service
+                response = await AUTH_CLIENT.get(
+                    AUTH_PROFILE_PATH,
+                    headers={"Authorization": f"Bearer {token}"}
                 )
                 
                 if response.status_code != 200:
@@ -120,9 +158,11 @@ class AuthMiddleware(BaseHTTPMiddleware):
                         content={"detail": "User account is inactive"}
                     )
                 
-                # Add user info to request state
-                request.state.current_user = user
+                cache_user(token, user)
                 logger.info(f"🔐 Authenticated user: {user.get('email')} - Role: {user.get('role')}")
+            
+            # Add user info to request state
+            request.state.current_user = user
         
         except Exception as e:
             logger.error(f"🚫 Authentication failed: {str(e)}")
@@ -157,18 +197,6 @@ async def general_exception_handler(request: Request, exc: Exception):
 # Include routers
 app.include_router(inventory_router, prefix="/api/v1")
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("[STARTUP] Starting Inventory Management System...")
-    try:
-        await create_schema_and_tables()
-        logger.info("[SUCCESS] Inventory schema and tables created successfully")
-        
-    except Exception as e:
-        logger.error(f"[ERROR] Failed to initialize inventory database: {str(e)}")
-        # Don't raise here - let the server start anyway
-        logger.warning("[WARNING] Server starting with database issues - some features may not work")
-
 @app.get("/")
 async def root():
     return {
@@ -22,7 +22,7 @@ class Category(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid4()))
     name = Column(String(100), nullable=False, unique=True)
     description = Column(Text)
-    size_type = Column(Enum(SizeType), default=SizeType.CLOTHING)
+    size_type = Column(Enum(SizeType, name="sizetype", schema=SCHEMA_NAME), default=SizeType.CLOTHING)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
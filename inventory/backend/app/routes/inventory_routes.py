@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from ..database import get_database
+from ..database import get_async_database
 from ..services.inventory_service import InventoryService
+from .. import external_auth
 import logging
 import traceback
 
@@ -16,17 +17,7 @@ def check_permission(request: Request, required_action: str):
     
     user_role = user.get("role", "viewer")
     
-    # Define inventory permissions by role
-    role_permissions = {
-        "admin": ["create", "read", "update", "delete", "manage"],
-        "manager": ["create", "read", "update", "delete"],
-        "employee": ["read", "update"],
-        "viewer": ["read"]
-    }
-    
-    user_permissions = role_permissions.get(user_role, [])
-    
-    if required_action not in user_permissions:
+    if not external_auth.check_permission(user_role, required_action):
         raise HTTPException(
             status_code=403,
             detail=f"Insufficient permissions. Role '{user_role}' cannot '{required_action}' inventory resources."
@@ -52,130 +43,130 @@ router = APIRouter()
 
 # Category Routes
 @router.post("/categories/", response_model=Category)
-def create_category(
+async def create_category(
     category: CategoryCreate, 
     request: Request,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     check_permission(request, "create")
     logger.info(f"category: {category}")
     service = InventoryService(db)
-    return service.create_category(category)
+    return await service.create_category(category)
 
 @router.get("/categories/", response_model=List[Category])
-def get_categories(
+async def get_categories(
     request: Request,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     check_permission(request, "read")
     service = InventoryService(db)
-    return service.get_categories()
+    return await service.get_categories()
 
 @router.get("/categories/{category_id}", response_model=Category)
-def get_category(
+async def get_category(
     category_id: str, 
     request: Request,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     check_permission(request, "read")
     service = InventoryService(db)
-    category = service.get_category(category_id)
+    category = await service.get_category(category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return category
 
 @router.put("/categories/{category_id}", response_model=Category)
-def update_category(
+async def update_category(
     category_id: str, 
     category: CategoryUpdate, 
     request: Request,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     check_permission(request, "update")
     service = InventoryService(db)
-    updated_category = service.update_category(category_id, category)
+    updated_category = await service.update_category(category_id, category)
     if not updated_category:
         raise HTTPException(status_code=404, detail="Category not found")
     return updated_category
 
 @router.delete("/categories/{category_id}")
-def delete_category(category_id: str, db: Session = Depends(get_database)):
+async def delete_category(category_id: str, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    if not service.delete_category(category_id):
+    if not await service.delete_category(category_id):
         raise HTTPException(status_code=404, detail="Category not found")
     return {"message": "Category deleted successfully"}
 
 # Brand Routes
 @router.post("/brands/", response_model=Brand)
-def create_brand(brand: BrandCreate, db: Session = Depends(get_database)):
+async def create_brand(brand: BrandCreate, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.create_brand(brand)
+    return await service.create_brand(brand)
 
 @router.get("/brands/", response_model=List[Brand])
-def get_brands(db: Session = Depends(get_database)):
+async def get_brands(db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.get_brands()
+    return await service.get_brands()
 
 @router.get("/brands/{brand_id}", response_model=Brand)
-def get_brand(brand_id: str, db: Session = Depends(get_database)):
+async def get_brand(brand_id: str, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    brand = service.get_brand(brand_id)
+    brand = await service.get_brand(brand_id)
     if not brand:
         raise HTTPException(status_code=404, detail="Brand not found")
     return brand
 
 @router.put("/brands/{brand_id}", response_model=Brand)
-def update_brand(brand_id: str, brand: BrandUpdate, db: Session = Depends(get_database)):
+async def update_brand(brand_id: str, brand: BrandUpdate, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    updated_brand = service.update_brand(brand_id, brand)
+    updated_brand = await service.update_brand(brand_id, brand)
     if not updated_brand:
         raise HTTPException(status_code=404, detail="Brand not found")
     return updated_brand
 
 @router.delete("/brands/{brand_id}")
-def delete_brand(brand_id: str, db: Session = Depends(get_database)):
+async def delete_brand(brand_id: str, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    if not service.delete_brand(brand_id):
+    if not await service.delete_brand(brand_id):
         raise HTTPException(status_code=404, detail="Brand not found")
     return {"message": "Brand deleted successfully"}
 
 # Supplier Routes
 @router.post("/suppliers/", response_model=Supplier, response_model_by_alias=True)
-def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_database)):
+async def create_supplier(supplier: SupplierCreate, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.create_supplier(supplier)
+    return await service.create_supplier(supplier)
 
 @router.get("/suppliers/", response_model=List[Supplier], response_model_by_alias=True)
-def get_suppliers(db: Session = Depends(get_database)):
+async def get_suppliers(db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.get_suppliers()
+    return await service.get_suppliers()
 
 @router.get("/suppliers/{supplier_id}", response_model=Supplier, response_model_by_alias=True)
-def get_supplier(supplier_id: str, db: Session = Depends(get_database)):
+async def get_supplier(supplier_id: str, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    supplier = service.get_supplier(supplier_id)
+    supplier = await service.get_supplier(supplier_id)
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return supplier
 
 @router.put("/suppliers/{supplier_id}", response_model=Supplier, response_model_by_alias=True)
-def update_supplier(supplier_id: str, supplier: SupplierUpdate, db: Session = Depends(get_database)):
+async def update_supplier(supplier_id: str, supplier: SupplierUpdate, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    updated_supplier = service.update_supplier(supplier_id, supplier)
+    updated_supplier = await service.update_supplier(supplier_id, supplier)
     if not updated_supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return updated_supplier
 
 @router.delete("/suppliers/{supplier_id}")
-def delete_supplier(supplier_id: str, db: Session = Depends(get_database)):
+async def delete_supplier(supplier_id: str, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    if not service.delete_supplier(supplier_id):
+    if not await service.delete_supplier(supplier_id):
         raise HTTPException(status_code=404, detail="Supplier not found")
     return {"message": "Supplier deleted successfully"}
 
 # Product Routes
 @router.post("/products/", response_model=Product, response_model_by_alias=True)
-def create_product(product: ProductCreate, db: Session = Depends(get_database)):
+async def create_product(product: ProductCreate, db: AsyncSession = Depends(get_async_database)):
     logger.info(f"🏭 Creating new product: {product.name}")
     logger.debug(f"📦 Product data: {product.dict()}")
     
@@ -194,7 +185,7 @@ def create_product(product: ProductCreate, db: Session = Depends(get_database)):
         cleaned_product = ProductCreate(**product_dict)
         
         service = InventoryService(db)
-        result = service.create_product(cleaned_product)
+        result = await service.create_product(cleaned_product)
         logger.info(f"✅ Product created successfully with ID: {result.id}")
         return result
     except ValueError as e:
@@ -223,16 +214,16 @@ def create_product(product: ProductCreate, db: Session = Depends(get_database)):
             raise HTTPException(status_code=500, detail="Unable to create product. Please try again.")
 
 @router.get("/products/")
-def get_products(
+async def get_products(
     page: int = 1,
     limit: int = 50,
     search: Optional[str] = None,
     category_id: Optional[str] = None,
     brand_id: Optional[str] = None,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     service = InventoryService(db)
-    products = service.get_products(category_id, brand_id)
+    products = await service.get_products(category_id, brand_id)
     
     # Apply search filter if provided
     if search:
@@ -260,18 +251,18 @@ def get_products(
     }
 
 @router.get("/products/{product_id}", response_model=Product, response_model_by_alias=True)
-def get_product(product_id: str, db: Session = Depends(get_database)):
+async def get_product(product_id: str, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    product = service.get_product(product_id)
+    product = await service.get_product(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 @router.put("/products/{product_id}", response_model=Product, response_model_by_alias=True)
-def update_product(product_id: str, product: ProductUpdate, db: Session = Depends(get_database)):
+async def update_product(product_id: str, product: ProductUpdate, db: AsyncSession = Depends(get_async_database)):
     try:
         service = InventoryService(db)
-        updated_product = service.update_product(product_id, product)
+        updated_product = await service.update_product(product_id, product)
         if not updated_product:
             raise HTTPException(status_code=404, detail="Product not found")
         return updated_product
@@ -283,10 +274,10 @@ def update_product(product_id: str, product: ProductUpdate, db: Session = Depend
             raise HTTPException(status_code=500, detail="Failed to update product. Please try again.")
 
 @router.delete("/products/{product_id}")
-def delete_product(product_id: str, db: Session = Depends(get_database)):
+async def delete_product(product_id: str, db: AsyncSession = Depends(get_async_database)):
     try:
         service = InventoryService(db)
-        if not service.delete_product(product_id):
+        if not await service.delete_product(product_id):
             raise HTTPException(status_code=404, detail="Product not found")
         return {"message": "Product deleted successfully"}
     except Exception as e:
@@ -298,74 +289,74 @@ def delete_product(product_id: str, db: Session = Depends(get_database)):
 
 # Stock Routes
 @router.post("/stock/", response_model=StockItem)
-def create_stock_item(stock_item: StockItemCreate, db: Session = Depends(get_database)):
+async def create_stock_item(stock_item: StockItemCreate, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.create_stock_item(stock_item)
+    return await service.create_stock_item(stock_item)
 
 @router.get("/stock/", response_model=List[StockItem])
-def get_stock_items(product_id: Optional[str] = None, db: Session = Depends(get_database)):
+async def get_stock_items(product_id: Optional[str] = None, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.get_stock_items(product_id)
+    return await service.get_stock_items(product_id)
 
 @router.get("/stock/low-stock", response_model=List[StockItem])
-def get_low_stock_items(db: Session = Depends(get_database)):
+async def get_low_stock_items(db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.get_low_stock_items()
+    return await service.get_low_stock_items()
 
 @router.put("/stock/{product_id}/{size}/adjust")
-def adjust_stock(
+async def adjust_stock(
     product_id: str,
     size: str,
     quantity_change: int,
     reference_id: Optional[str] = None,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     service = InventoryService(db)
-    stock_item = service.update_stock_quantity(product_id, size, quantity_change, "adjustment", reference_id)
+    stock_item = await service.update_stock_quantity(product_id, size, quantity_change, "adjustment", reference_id)
     if not stock_item:
         raise HTTPException(status_code=404, detail="Stock item not found")
     return {"message": "Stock adjusted successfully", "new_quantity": stock_item.quantity}
 
 # Purchase Order Routes
 @router.post("/purchase-orders/", response_model=PurchaseOrder)
-def create_purchase_order(purchase_order: PurchaseOrderCreate, db: Session = Depends(get_database)):
+async def create_purchase_order(purchase_order: PurchaseOrderCreate, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.create_purchase_order(purchase_order)
+    return await service.create_purchase_order(purchase_order)
 
 @router.get("/purchase-orders/", response_model=List[PurchaseOrder])
-def get_purchase_orders(status: Optional[str] = None, db: Session = Depends(get_database)):
+async def get_purchase_orders(status: Optional[str] = None, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.get_purchase_orders(status)
+    return await service.get_purchase_orders(status)
 
 @router.get("/purchase-orders/{po_id}", response_model=PurchaseOrder)
-def get_purchase_order(po_id: str, db: Session = Depends(get_database)):
+async def get_purchase_order(po_id: str, db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    po = service.get_purchase_order(po_id)
+    po = await service.get_purchase_order(po_id)
     if not po:
         raise HTTPException(status_code=404, detail="Purchase order not found")
     return po
 
 @router.put("/purchase-orders/{po_id}/receive/{item_id}")
-def receive_purchase_order_item(
+async def receive_purchase_order_item(
     po_id: str,
     item_id: str,
     quantity_received: int,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     service = InventoryService(db)
-    item = service.receive_purchase_order_item(po_id, item_id, quantity_received)
+    item = await service.receive_purchase_order_item(po_id, item_id, quantity_received)
     if not item:
         raise HTTPException(status_code=404, detail="Purchase order item not found")
     return {"message": "Items received successfully"}
 
 # Dashboard Routes
 @router.get("/dashboard/stats", response_model=DashboardStats)
-def get_dashboard_stats(db: Session = Depends(get_database)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
-    return service.get_dashboard_stats()
+    return await service.get_dashboard_stats()
 
 @router.post("/sync/erp")
-async def sync_with_erp(db: Session = Depends(get_database)):
+async def sync_with_erp(db: AsyncSession = Depends(get_async_database)):
     service = InventoryService(db)
     success = await service.sync_with_erp()
     if success:
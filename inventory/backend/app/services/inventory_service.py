@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import select, delete, and_, func
 from typing import List, Optional
 from ..models.inventory_models import (
     Product, Category, Brand, Supplier, StockItem, 
@@ -20,105 +21,124 @@ from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Relationships the response schemas read. Async sessions cannot lazy load, so
+# every query whose results are serialized loads these up front.
+_PRODUCT_LOAD_OPTIONS = (
+    joinedload(Product.category),
+    joinedload(Product.brand),
+    joinedload(Product.supplier),
+    selectinload(Product.stock_items),
+)
+_STOCK_ITEM_LOAD_OPTIONS = (
+    selectinload(StockItem.product).options(*_PRODUCT_LOAD_OPTIONS),
+)
+_PURCHASE_ORDER_LOAD_OPTIONS = (
+    joinedload(PurchaseOrder.supplier),
+    selectinload(PurchaseOrder.items).selectinload(PurchaseOrderItem.product).options(*_PRODUCT_LOAD_OPTIONS),
+)
+
 class InventoryService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     # Category Methods
-    def create_category(self, category_data: CategoryCreate) -> Category:
+    async def create_category(self, category_data: CategoryCreate) -> Category:
         category = Category(**category_data.dict())
         self.db.add(category)
-        self.db.commit()
-        self.db.refresh(category)
+        await self.db.commit()
+        await self.db.refresh(category)
         return category
 
-    def get_categories(self) -> List[Category]:
-        return self.db.query(Category).all()
+    async def get_categories(self) -> List[Category]:
+        result = await self.db.execute(select(Category))
+        return result.scalars().all()
 
-    def get_category(self, category_id: str) -> Optional[Category]:
-        return self.db.query(Category).filter(Category.id == category_id).first()
+    async def get_category(self, category_id: str) -> Optional[Category]:
+        return await self.db.get(Category, category_id)
 
-    def update_category(self, category_id: str, category_data: CategoryUpdate) -> Optional[Category]:
-        category = self.get_category(category_id)
+    async def update_category(self, category_id: str, category_data: CategoryUpdate) -> Optional[Category]:
+        category = await self.get_category(category_id)
         if category:
             for field, value in category_data.dict(exclude_unset=True).items():
                 setattr(category, field, value)
-            self.db.commit()
-            self.db.refresh(category)
+            await self.db.commit()
+            await self.db.refresh(category)
         return category
 
-    def delete_category(self, category_id: str) -> bool:
-        category = self.get_category(category_id)
+    async def delete_category(self, category_id: str) -> bool:
+        category = await self.get_category(category_id)
         if category:
-            self.db.delete(category)
-            self.db.commit()
+            await self.db.delete(category)
+            await self.db.commit()
             return True
         return False
 
     # Brand Methods
-    def create_brand(self, brand_data: BrandCreate) -> Brand:
+    async def create_brand(self, brand_data: BrandCreate) -> Brand:
         brand = Brand(**brand_data.dict())
         self.db.add(brand)
-        self.db.commit()
-        self.db.refresh(brand)
+        await self.db.commit()
+        await self.db.refresh(brand)
         return brand
 
-    def get_brands(self) -> List[Brand]:
-        return self.db.query(Brand).all()
+    async def get_brands(self) -> List[Brand]:
+        result = await self.db.execute(select(Brand))
+        return result.scalars().all()
 
-    def get_brand(self, brand_id: str) -> Optional[Brand]:
-        return self.db.query(Brand).filter(Brand.id == brand_id).first()
+    async def get_brand(self, brand_id: str) -> Optional[Brand]:
+        return await self.db.get(Brand, brand_id)
 
-    def update_brand(self, brand_id: str, brand_data: BrandUpdate) -> Optional[Brand]:
-        brand = self.get_brand(brand_id)
+    async def update_brand(self, brand_id: str, brand_data: BrandUpdate) -> Optional[Brand]:
+        brand = await self.get_brand(brand_id)
         if brand:
             for field, value in brand_data.dict(exclude_unset=True).items():
                 setattr(brand, field, value)
-            self.db.commit()
-            self.db.refresh(brand)
+            await self.db.commit()
+            await self.db.refresh(brand)
         return brand
 
-    def delete_brand(self, brand_id: str) -> bool:
-        brand = self.get_brand(brand_id)
+    async def delete_brand(self, brand_id: str) -> bool:
+        brand = await self.get_brand(brand_id)
         if brand:
-            self.db.delete(brand)
-            self.db.commit()
+            await self.db.delete(brand)
+            await self.db.commit()
             return True
         return False
 
     # Supplier Methods
-    def create_supplier(self, supplier_data: SupplierCreate) -> Supplier:
+    async def create_supplier(self, supplier_data: SupplierCreate) -> Supplier:
         supplier = Supplier(**supplier_data.dict())
         self.db.add(supplier)
-        self.db.commit()
-        self.db.refresh(supplier)
+        await self.db.commit()
+        await self.db.refresh(supplier)
         return supplier
 
-    def get_suppliers(self) -> List[Supplier]:
-        return self.db.query(Supplier).all()
+    async def get_suppliers(self) -> List[Supplier]:
+        result = await self.db.execute(select(Supplier))
+        return result.scalars().all()
 
-    def get_supplier(self, supplier_id: str) -> Optional[Supplier]:
-        return self.db.query(Supplier).filter(Supplier.id == supplier_id).first()
+    async def get_supplier(self, supplier_id: str) -> Optional[Supplier]:
+        return await self.db.get(Supplier, supplier_id)
 
-    def update_supplier(self, supplier_id: str, supplier_data: SupplierUpdate) -> Optional[Supplier]:
-        supplier = self.get_supplier(supplier_id)
+    async def update_supplier(self, supplier_id: str, supplier_data: SupplierUpdate) -> Optional[Supplier]:
+        supplier = await self.get_supplier(supplier_id)
         if supplier:
             for field, value in supplier_data.dict(exclude_unset=True).items():
                 setattr(supplier, field, value)
-            self.db.commit()
-            self.db.refresh(supplier)
+            await self.db.commit()
+            await self.db.refresh(supplier)
         return supplier
 
-    def delete_supplier(self, supplier_id: str) -> bool:
-        supplier = self.get_supplier(supplier_id)
+    async def delete_supplier(self, supplier_id: str) -> bool:
+        supplier = await self.get_supplier(supplier_id)
         if supplier:
-            self.db.delete(supplier)
-            self.db.commit()
+            await self.db.delete(supplier)
+            await self.db.commit()
             return True
         return False
 
     # Product Methods
-    def create_product(self, product_data: ProductCreate) -> Product:
+    async def create_product(self, product_data: ProductCreate) -> Product:
         logger.info(f"🏭 Service: Creating product '{product_data.name}'")
         
         try:
@@ -132,8 +152,8 @@ class InventoryService:
             
             product = Product(**product_dict)
             self.db.add(product)
-            self.db.commit()
-            self.db.refresh(product)
+            await self.db.commit()
+            await self.db.refresh(product)
             logger.info(f"✅ Product created with ID: {product.id}")
             
             # Create stock items for each size
@@ -150,31 +170,26 @@ class InventoryService:
                 self.db.add(stock_item)
             
             if sizes_data:
-                self.db.commit()
-                self.db.refresh(product)
+                await self.db.commit()
                 logger.info(f"✅ Created {len(sizes_data)} stock items for product {product.id}")
             
-            return product
+            return await self.get_product(product.id)
             
         except Exception as e:
             logger.error(f"❌ Error creating product: {str(e)}")
-            self.db.rollback()
+            await self.db.rollback()
             raise
 
-    def get_products(self, category_id: Optional[str] = None, brand_id: Optional[str] = None) -> List[Product]:
-        query = self.db.query(Product).options(
-            joinedload(Product.category),
-            joinedload(Product.brand),
-            joinedload(Product.supplier),
-            joinedload(Product.stock_items)
-        )
+    async def get_products(self, category_id: Optional[str] = None, brand_id: Optional[str] = None) -> List[Product]:
+        query = select(Product).options(*_PRODUCT_LOAD_OPTIONS)
         
         if category_id:
-            query = query.filter(Product.category_id == category_id)
+            query = query.where(Product.category_id == category_id)
         if brand_id:
-            query = query.filter(Product.brand_id == brand_id)
+            query = query.where(Product.brand_id == brand_id)
         
-        products = query.all()
+        result = await self.db.execute(query)
+        products = result.scalars().all()
         
         # Debug: Log the first product's prices if any products exist
         if products:
@@ -183,57 +198,71 @@ class InventoryService:
             
         return products
 
-    def get_product(self, product_id: str) -> Optional[Product]:
-        return self.db.query(Product).filter(Product.id == product_id).first()
+    async def get_product(self, product_id: str) -> Optional[Product]:
+        result = await self.db.execute(
+            select(Product)
+            .where(Product.id == product_id)
+            .options(*_PRODUCT_LOAD_OPTIONS)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
 
-    def update_product(self, product_id: str, product_data: ProductUpdate) -> Optional[Product]:
-        product = self.get_product(product_id)
+    async def update_product(self, product_id: str, product_data: ProductUpdate) -> Optional[Product]:
+        product = await self.get_product(product_id)
         if product:
             for field, value in product_data.dict(exclude_unset=True).items():
                 setattr(product, field, value)
-            self.db.commit()
-            self.db.refresh(product)
+            await self.db.commit()
+            # Reload so changed foreign keys come back with their related rows
+            product = await self.get_product(product_id)
         return product
 
-    def delete_product(self, product_id: str) -> bool:
-        product = self.get_product(product_id)
+    async def delete_product(self, product_id: str) -> bool:
+        product = await self.get_product(product_id)
         if product:
             try:
                 # First delete all related stock items
-                self.db.query(StockItem).filter(StockItem.product_id == product_id).delete()
+                await self.db.execute(delete(StockItem).where(StockItem.product_id == product_id))
                 
                 # Then delete the product
-                self.db.delete(product)
-                self.db.commit()
+                await self.db.delete(product)
+                await self.db.commit()
                 return True
             except Exception as e:
-                self.db.rollback()
+                await self.db.rollback()
                 logger.error(f"Error deleting product {product_id}: {str(e)}")
                 raise
         return False
 
     # Stock Item Methods
-    def create_stock_item(self, stock_data: StockItemCreate) -> StockItem:
+    async def create_stock_item(self, stock_data: StockItemCreate) -> StockItem:
         stock_item = StockItem(**stock_data.dict())
         self.db.add(stock_item)
-        self.db.commit()
-        self.db.refresh(stock_item)
-        return stock_item
+        await self.db.commit()
+        return await self.get_stock_item(stock_item.id)
 
-    def get_stock_items(self, product_id: Optional[str] = None) -> List[StockItem]:
-        query = self.db.query(StockItem)
+    async def get_stock_items(self, product_id: Optional[str] = None) -> List[StockItem]:
+        query = select(StockItem).options(*_STOCK_ITEM_LOAD_OPTIONS)
         if product_id:
-            query = query.filter(StockItem.product_id == product_id)
-        return query.all()
-
-    def get_stock_item(self, stock_item_id: str) -> Optional[StockItem]:
-        return self.db.query(StockItem).filter(StockItem.id == stock_item_id).first()
+            query = query.where(StockItem.product_id == product_id)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_stock_item(self, stock_item_id: str) -> Optional[StockItem]:
+        result = await self.db.execute(
+            select(StockItem)
+            .where(StockItem.id == stock_item_id)
+            .options(*_STOCK_ITEM_LOAD_OPTIONS)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
 
-    def update_stock_quantity(self, product_id: str, size: str, quantity_change: int, movement_type: str = "adjustment", reference_id: Optional[str] = None):
+    async def update_stock_quantity(self, product_id: str, size: str, quantity_change: int, movement_type: str = "adjustment", reference_id: Optional[str] = None):
         # Find stock item
-        stock_item = self.db.query(StockItem).filter(
+        result = await self.db.execute(select(StockItem).where(
             and_(StockItem.product_id == product_id, StockItem.size == size)
-        ).first()
+        ))
+        stock_item = result.scalars().first()
         
         if stock_item:
             stock_item.quantity += quantity_change
@@ -247,23 +276,26 @@ class InventoryService:
                 reference_id=reference_id
             )
             self.db.add(movement)
-            self.db.commit()
-            self.db.refresh(stock_item)
+            await self.db.commit()
+            await self.db.refresh(stock_item)
             return stock_item
         return None
 
-    def get_low_stock_items(self) -> List[StockItem]:
-        return self.db.query(StockItem).filter(
-            StockItem.quantity <= StockItem.reorder_level
-        ).all()
+    async def get_low_stock_items(self) -> List[StockItem]:
+        result = await self.db.execute(
+            select(StockItem)
+            .where(StockItem.quantity <= StockItem.reorder_level)
+            .options(*_STOCK_ITEM_LOAD_OPTIONS)
+        )
+        return result.scalars().all()
 
     # Purchase Order Methods
-    def create_purchase_order(self, po_data: PurchaseOrderCreate) -> PurchaseOrder:
+    async def create_purchase_order(self, po_data: PurchaseOrderCreate) -> PurchaseOrder:
         # Create purchase order
         po_dict = po_data.dict(exclude={'items'})
         purchase_order = PurchaseOrder(**po_dict)
         self.db.add(purchase_order)
-        self.db.flush()  # Get the ID without committing
+        await self.db.flush()  # Get the ID without committing
         
         # Add items and calculate total
         total_amount = 0.0
@@ -277,29 +309,36 @@ class InventoryService:
             self.db.add(item)
         
         purchase_order.total_amount = total_amount
-        self.db.commit()
-        self.db.refresh(purchase_order)
-        return purchase_order
+        await self.db.commit()
+        return await self.get_purchase_order(purchase_order.id)
 
-    def get_purchase_orders(self, status: Optional[str] = None) -> List[PurchaseOrder]:
-        query = self.db.query(PurchaseOrder)
+    async def get_purchase_orders(self, status: Optional[str] = None) -> List[PurchaseOrder]:
+        query = select(PurchaseOrder).options(*_PURCHASE_ORDER_LOAD_OPTIONS)
         if status:
-            query = query.filter(PurchaseOrder.status == status)
-        return query.all()
-
-    def get_purchase_order(self, po_id: str) -> Optional[PurchaseOrder]:
-        return self.db.query(PurchaseOrder).filter(PurchaseOrder.id == po_id).first()
+            query = query.where(PurchaseOrder.status == status)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_purchase_order(self, po_id: str) -> Optional[PurchaseOrder]:
+        result = await self.db.execute(
+            select(PurchaseOrder)
+            .where(PurchaseOrder.id == po_id)
+            .options(*_PURCHASE_ORDER_LOAD_OPTIONS)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
 
-    def receive_purchase_order_item(self, po_id: str, item_id: str, quantity_received: int):
-        item = self.db.query(PurchaseOrderItem).filter(
+    async def receive_purchase_order_item(self, po_id: str, item_id: str, quantity_received: int):
+        result = await self.db.execute(select(PurchaseOrderItem).where(
             and_(PurchaseOrderItem.purchase_order_id == po_id, PurchaseOrderItem.id == item_id)
-        ).first()
+        ))
+        item = result.scalars().first()
         
         if item:
             item.quantity_received += quantity_received
             
             # Update stock
-            self.update_stock_quantity(
+            await self.update_stock_quantity(
                 item.product_id, 
                 item.size, 
                 quantity_received, 
@@ -307,26 +346,26 @@ class InventoryService:
                 po_id
             )
             
-            self.db.commit()
+            await self.db.commit()
             return item
         return None
 
     # Dashboard Methods
-    def get_dashboard_stats(self):
-        total_products = self.db.query(Product).count()
-        total_stock_items = self.db.query(StockItem).count()
-        low_stock_items = self.db.query(StockItem).filter(
-            StockItem.quantity <= StockItem.reorder_level
-        ).count()
-        total_suppliers = self.db.query(Supplier).count()
-        pending_orders = self.db.query(PurchaseOrder).filter(
-            PurchaseOrder.status == "pending"
-        ).count()
+    async def get_dashboard_stats(self):
+        total_products = await self.db.scalar(select(func.count()).select_from(Product))
+        total_stock_items = await self.db.scalar(select(func.count()).select_from(StockItem))
+        low_stock_items = await self.db.scalar(
+            select(func.count()).select_from(StockItem).where(StockItem.quantity <= StockItem.reorder_level)
+        )
+        total_suppliers = await self.db.scalar(select(func.count()).select_from(Supplier))
+        pending_orders = await self.db.scalar(
+            select(func.count()).select_from(PurchaseOrder).where(PurchaseOrder.status == "pending")
+        )
         
         # Calculate inventory value
-        inventory_value = self.db.query(
-            func.sum(StockItem.quantity * Product.cost_price)
-        ).join(Product).scalar() or 0.0
+        inventory_value = await self.db.scalar(
+            select(func.sum(StockItem.quantity * Product.cost_price)).join(Product)
+        ) or 0.0
         
         return {
             "total_products": total_products,
@@ -343,7 +382,10 @@ class InventoryService:
         try:
             async with httpx.AsyncClient() as client:
                 # Get all products with stock
-                products_with_stock = self.db.query(Product).join(StockItem).all()
+                result = await self.db.execute(
+                    select(Product).join(StockItem).options(selectinload(Product.stock_items))
+                )
+                products_with_stock = result.scalars().unique().all()
                 
                 for product in products_with_stock:
                     stock_data = {
@@ -362,4 +404,4 @@ class InventoryService:
         except Exception as e:
             print(f"ERP sync error: {e}")
             return False
-        return True
\ No newline at end of file
+        return True
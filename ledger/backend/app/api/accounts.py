@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import logging
@@ -28,15 +28,18 @@ router = APIRouter(
            - Account types (asset, liability, equity, revenue, expense)
            - Current balances
            - Active status
+           
+           Pass `active_only=true` to leave out inactive accounts.
            """)
 async def list_accounts(
+    active_only: bool = Query(False, description="Only return active accounts"),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all accounts."""
     logger.info(f"[LIST] Retrieving all accounts for user: {current_user.get('username')}")
     try:
-        accounts = await get_all_accounts(db)
+        accounts = await get_all_accounts(db, active_only=active_only)
         logger.info(f"[SUCCESS] Successfully retrieved {len(accounts)} accounts")
         return accounts
     except Exception as e:
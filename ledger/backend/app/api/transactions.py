@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import logging
@@ -10,6 +11,7 @@ from ..services.ledger import (
     create_transaction,
     get_transaction_by_id,
     validate_transaction_data,
+    line_totals,
     validate_transaction_integrity,
     validate_all_transactions_integrity,
     get_accounting_equation_status,
@@ -23,6 +25,10 @@ router = APIRouter(
     tags=["transactions"],
 )
 
+# The list is built from validated models already; dump it once in pydantic-core
+# instead of letting FastAPI re-validate and jsonable_encode every row.
+_transaction_list_adapter = TypeAdapter(List[TransactionResponse])
+
 
 @router.get("", response_model=List[TransactionResponse],
            summary="[DATABASE] List All Transactions",
@@ -72,7 +78,7 @@ async def list_transactions(
             ))
         
         logger.info(f"[SUCCESS] Successfully transformed and returning {len(result)} transactions")
-        return result
+        return Response(content=_transaction_list_adapter.dump_json(result), media_type="application/json")
     except Exception as e:
         logger.error(f"[ERROR] Error retrieving transactions: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve transactions")
@@ -104,8 +110,7 @@ async def add_transaction(
     logger.info(f"[TRANSACTION] Creating new transaction: '{transaction.description}' with {len(transaction.lines)} lines by user: {current_user.get('username')}")
     
     # Log transaction details
-    total_debit = sum(line.amount for line in transaction.lines if line.type == 'debit')
-    total_credit = sum(line.amount for line in transaction.lines if line.type == 'credit')
+    total_debit, total_credit = line_totals(transaction.lines)
     logger.info(f"[DATABASE] Transaction balance check: Debit={total_debit}, Credit={total_credit}")
     
     for i, line in enumerate(transaction.lines, 1):
@@ -222,6 +227,7 @@ async def validate_transaction(
     
     try:
         validation_result = await validate_transaction_data(db, transaction)
+        total_debits, total_credits = line_totals(transaction.lines)
         
         return {
             "is_valid": validation_result.is_valid,
@@ -229,8 +235,8 @@ async def validate_transaction(
             "warnings": validation_result.warnings,
             "transaction_description": transaction.description,
             "total_lines": len(transaction.lines),
-            "total_debits": sum(line.amount for line in transaction.lines if line.type == 'debit'),
-            "total_credits": sum(line.amount for line in transaction.lines if line.type == 'credit'),
+            "total_debits": float(total_debits),
+            "total_credits": float(total_credits),
         }
     except Exception as e:
         logger.error(f"[ERROR] Error validating transaction: {str(e)}")
@@ -1,6 +1,7 @@
 import os
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
@@ -20,15 +21,52 @@ parsed = urlparse(DATABASE_URL)
 # print("DB PASSWORD:", parsed.password)
 # print("DB NAME:", parsed.path.lstrip('/'))
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine_kwargs = {
+    # Statement logging formats every query and its parameters; opt in for debugging only
+    "echo": os.getenv("SQL_ECHO", "false").lower() == "true",
+}
+if DATABASE_URL.startswith("postgresql"):
+    engine_kwargs.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+if DATABASE_URL.startswith("postgresql+asyncpg"):
+    # PgBouncer in transaction mode cannot keep server-side prepared statements
+    statement_cache = 0 if os.getenv("PGBOUNCER", "false").lower() == "true" else 500
+    engine_kwargs["connect_args"] = {
+        "prepared_statement_cache_size": statement_cache,
+        "statement_cache_size": statement_cache,
+        # Planning-time JIT only slows down short OLTP queries like ours
+        "server_settings": {"jit": "off"},
+    }
+
+engine = create_async_engine(DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 # Schema configuration
 LEDGER_SCHEMA = "ledger"
 
+# Run schema/table DDL on startup; turn off where the schema is provisioned separately
+CREATE_TABLES_ON_STARTUP = os.getenv("CREATE_TABLES_ON_STARTUP", "true").lower() == "true"
+
 # Auth Service Integration
 AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://localhost:8004")
 
+# Browser origins allowed to call the API (comma-separated)
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "CORS_ORIGINS",
+        "http://localhost:3000,http://localhost:3001,http://localhost:3002,"
+        "http://localhost:3003,http://localhost:3005,http://localhost:5173",
+    ).split(",")
+    if origin.strip()
+]
+
 # Async session generator
 async def get_session():
     """Get async database session."""
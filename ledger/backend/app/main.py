@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 import httpx
@@ -6,10 +7,11 @@ import httpx
 from .config import engine, create_session, SessionLocal
 from .services.ledger import Base, Account, AccountType
 from sqlalchemy import select
+from sqlalchemy.pool import QueuePool
 from .api.router import api_router
 from .routes.periods import router as periods_router
 from .logging_config import setup_logging
-from .config import AUTH_SERVICE_URL
+from .config import AUTH_SERVICE_URL, CORS_ORIGINS, CREATE_TABLES_ON_STARTUP
 
 # External Auth Service Configuration (from environment)
 AUTH_API_URL = f"{AUTH_SERVICE_URL}/api/v1/auth"
@@ -55,6 +57,7 @@ app = FastAPI(
     },
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {
             "name": "accounts", 
@@ -78,10 +81,11 @@ app = FastAPI(
 # CORS middleware configuration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure for production: ["https://yourdomain.com"]
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["*"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # let browsers reuse preflight results for a day
 )
 
 # Database initialization
@@ -95,48 +99,56 @@ async def startup_event():
         # Handle database initialization with proper transaction isolation
         logger.info("[DATABASE] Starting database initialization...")
         
-        # Step 1: Clean schema setup
-        async with engine.begin() as conn:
-            logger.info("[SCHEMA] Creating ledger schema if it doesn't exist...")
-            await conn.execute(text("CREATE SCHEMA IF NOT EXISTS ledger;"))
-            await conn.execute(text("GRANT ALL ON SCHEMA ledger TO mguser;"))
-            logger.info("[SUCCESS] Schema 'ledger' created or already exists")
+        if CREATE_TABLES_ON_STARTUP:
+            # Step 1: Clean schema setup
+            async with engine.begin() as conn:
+                logger.info("[SCHEMA] Creating ledger schema if it doesn't exist...")
+                await conn.execute(text("CREATE SCHEMA IF NOT EXISTS ledger;"))
+                await conn.execute(text("GRANT ALL ON SCHEMA ledger TO mguser;"))
+                logger.info("[SUCCESS] Schema 'ledger' created or already exists")
             
-        # Step 2: Let SQLAlchemy handle enum creation through table creation
-        # The enum will be created automatically in the correct schema when tables are created
+            # Step 2: Let SQLAlchemy handle enum creation through table creation
+            # The enum will be created automatically in the correct schema when tables are created
         
-        # Step 3: Create tables in separate transaction
-        async with engine.begin() as conn:
-            logger.info("[DATABASE] Creating tables...")
+            # Step 3: Create tables in separate transaction
+            async with engine.begin() as conn:
+                logger.info("[DATABASE] Creating tables...")
             
-            await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(Base.metadata.create_all)
             
-            # Grant permissions
-            await conn.execute(text("GRANT ALL ON ALL TABLES IN SCHEMA ledger TO mguser;"))
-            await conn.execute(text("GRANT ALL ON ALL SEQUENCES IN SCHEMA ledger TO mguser;"))
+                # date and created_at are filled by the database; tables created before that change lack the default
+                await conn.execute(text("ALTER TABLE ledger.transactions ALTER COLUMN date SET DEFAULT now();"))
+                await conn.execute(text("ALTER TABLE ledger.transactions ALTER COLUMN created_at SET DEFAULT now();"))
+                await conn.execute(text("ALTER TABLE ledger.accounting_periods ALTER COLUMN created_at SET DEFAULT now();"))
             
-            # Verify enum values after table creation
-            try:
-                enum_values_result = await conn.execute(text(
-                    "SELECT e.enumlabel FROM pg_enum e "
-                    "JOIN pg_type t ON e.enumtypid = t.oid "
-                    "JOIN pg_namespace n ON t.typnamespace = n.oid "
-                    "WHERE t.typname = 'transactionsource' AND n.nspname = 'ledger'"
-                ))
-                rows = enum_values_result.fetchall()
-                enum_values = [row[0] for row in rows]
-                logger.info(f"[ENUM] Found ledger.transactionsource enum values: {enum_values}")
+                # Grant permissions
+                await conn.execute(text("GRANT ALL ON ALL TABLES IN SCHEMA ledger TO mguser;"))
+                await conn.execute(text("GRANT ALL ON ALL SEQUENCES IN SCHEMA ledger TO mguser;"))
+            
+                # Verify enum values after table creation
+                try:
+                    enum_values_result = await conn.execute(text(
+                        "SELECT e.enumlabel FROM pg_enum e "
+                        "JOIN pg_type t ON e.enumtypid = t.oid "
+                        "JOIN pg_namespace n ON t.typnamespace = n.oid "
+                        "WHERE t.typname = 'transactionsource' AND n.nspname = 'ledger'"
+                    ))
+                    rows = enum_values_result.fetchall()
+                    enum_values = [row[0] for row in rows]
+                    logger.info(f"[ENUM] Found ledger.transactionsource enum values: {enum_values}")
                 
-                if not enum_values:
-                    logger.warning("[ENUM] No enum values found in ledger schema")
-                else:
-                    logger.info(f"[SUCCESS] TransactionSource enum created successfully with values: {enum_values}")
+                    if not enum_values:
+                        logger.warning("[ENUM] No enum values found in ledger schema")
+                    else:
+                        logger.info(f"[SUCCESS] TransactionSource enum created successfully with values: {enum_values}")
                     
-            except Exception as verify_err:
-                logger.warning(f"[ENUM] Enum verification failed (non-fatal): {verify_err}")
-                # Don't fail startup for verification issues
+                except Exception as verify_err:
+                    logger.warning(f"[ENUM] Enum verification failed (non-fatal): {verify_err}")
+                    # Don't fail startup for verification issues
                 
-            logger.info("[SUCCESS] Database initialization completed")
+                logger.info("[SUCCESS] Database initialization completed")
+        else:
+            logger.info("[DATABASE] CREATE_TABLES_ON_STARTUP is off; skipping schema DDL")
         
         # Test auth service connection
         try:
@@ -210,6 +222,18 @@ def health_check():
         "version": "1.0.0"
     }
 
+def _pool_status():
+    """Connection pool occupancy, for tuning DB_POOL_SIZE / DB_MAX_OVERFLOW."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
 @app.get("/health", tags=["health"], summary="[SEARCH] Detailed Health Check",
          description="""
          Comprehensive health check with system information and available endpoints.
@@ -223,6 +247,7 @@ def detailed_health_check():
         "service": "MG-ERP Ledger API",
         "version": "1.0.0",
         "database": "PostgreSQL",
+        "database_pool": _pool_status(),
         "authentication": "External Auth Service (JWT Bearer Token)",
         "auth_service": AUTH_API_URL,
         "documentation": {
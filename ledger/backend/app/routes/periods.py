@@ -7,7 +7,7 @@ Endpoints for managing accounting periods and journal closure.
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 import logging
 
@@ -27,15 +27,16 @@ class PeriodCreate(BaseModel):
     fiscal_year: int
     name: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "period_start": "2025-12-01T00:00:00Z",
                 "period_end": "2025-12-31T23:59:59Z",
                 "fiscal_year": 2025,
                 "name": "December 2025"
             }
-        }
+        },
+    )
 
 
 class PeriodClose(BaseModel):
@@ -53,8 +54,7 @@ class PeriodResponse(BaseModel):
     closed_at: Optional[datetime]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Routes
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import List, Optional, Literal
-from datetime import datetime, timezone
+from datetime import datetime
 from ..services.ledger import AccountType, TransactionSource
 
 
@@ -12,10 +12,10 @@ class AccountSchema(BaseModel):
     description: Optional[str] = Field(None, description="Account description")
     is_active: Optional[bool] = Field(True, description="Whether the account is active")
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        use_enum_values=True,
+        json_schema_extra={
             "example": {
                 "name": "Cash in Bank",
                 "type": "asset",
@@ -23,23 +23,32 @@ class AccountSchema(BaseModel):
                 "description": "Main checking account for operations",
                 "is_active": True
             }
-        }
+        },
+    )
 
 
 class TransactionLineSchema(BaseModel):
-    account_name: str = Field(..., description="Name of the account for this journal entry")
+    account_id: Optional[int] = Field(None, description="ID of the account for this journal entry")
+    account_name: Optional[str] = Field(None, description="Name of the account (when account_id is not given)")
     type: Literal["debit", "credit"] = Field(..., description="Entry type: debit or credit")
     amount: float = Field(..., description="Amount for this journal entry", gt=0)
 
-    class Config:
-        from_attributes = True
-        schema_extra = {
+    @model_validator(mode="after")
+    def check_account_reference(self):
+        if self.account_id is None and not self.account_name:
+            raise ValueError("Either account_id or account_name is required")
+        return self
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
-                "account_name": "Cash in Bank",
+                "account_id": 1,
                 "type": "debit",
                 "amount": 1000.00
             }
-        }
+        },
+    )
 
 
 class TransactionLineResponse(BaseModel):
@@ -48,15 +57,14 @@ class TransactionLineResponse(BaseModel):
     type: Literal["debit", "credit"]
     amount: float
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TransactionSchema(BaseModel):
     id: Optional[int] = Field(None, description="Transaction ID (auto-generated)")
-    date: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        description="Transaction date"
+    date: Optional[datetime] = Field(
+        None,
+        description="Transaction date (defaults to when the database records it)"
     )
     description: str = Field(..., description="Transaction description", min_length=1)
     source: Optional[TransactionSource] = Field(
@@ -68,13 +76,13 @@ class TransactionSchema(BaseModel):
     lines: List[TransactionLineSchema] = Field(
         ..., 
         description="Journal entry lines (must balance: total debits = total credits)",
-        min_items=2
+        min_length=2
     )
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        use_enum_values=True,
+        json_schema_extra={
             "example": {
                 "description": "Office rent payment for January 2025",
                 "source": "manual",
@@ -92,7 +100,8 @@ class TransactionSchema(BaseModel):
                     }
                 ]
             }
-        }
+        },
+    )
 
 
 class TransactionResponse(BaseModel):
@@ -105,5 +114,4 @@ class TransactionResponse(BaseModel):
     created_by: Optional[str] = None
     lines: List[TransactionLineResponse]
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
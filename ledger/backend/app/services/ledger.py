@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, select, Enum, Table, Index, func, case, Boolean, CheckConstraint, UniqueConstraint, and_
-from sqlalchemy.orm import declarative_base, relationship, selectinload, validates
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, select, insert, Enum, Table, Index, func, case, text, Boolean, CheckConstraint, UniqueConstraint, and_
+from sqlalchemy.orm import declarative_base, relationship, selectinload, joinedload, raiseload, validates, configure_mappers, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List, Dict, Tuple
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_HALF_UP
+from cachetools import TTLCache
 import enum
 import logging
 
@@ -14,6 +18,12 @@ Base = declarative_base()
 # Schema configuration
 SCHEMA_NAME = "ledger"
 
+MONEY_QUANTUM = Decimal('0.01')
+
+def to_money(amount) -> Decimal:
+    """Convert an amount to an exact 2-decimal Decimal, rounding half up."""
+    return Decimal(str(amount)).quantize(MONEY_QUANTUM, rounding=ROUND_HALF_UP)
+
 class AccountType(enum.Enum):
     ASSET = "asset"
     LIABILITY = "liability"
@@ -26,21 +36,23 @@ class PeriodStatus(enum.Enum):
     CLOSED = "closed"
     LOCKED = "locked"
 
+# Relationships never lazy-load: async sessions can't run the implicit SELECT anyway,
+# so reads eager-load what they need and anything else fails with a clear error
+
 class Account(Base):
     __tablename__ = "accounts"
-    __table_args__ = {'schema': SCHEMA_NAME}
+    __table_args__ = (
+        # Partial index for pickers that only offer active accounts, in name order
+        Index('idx_accounts_active', 'name', postgresql_where=text('is_active')),
+        {'schema': SCHEMA_NAME}
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True)
     code = Column(String, nullable=False, unique=True)
     type = Column(Enum(AccountType), nullable=False)
     description = Column(String, nullable=True)
     is_active = Column(Boolean, nullable=False, default=True)
-    lines = relationship("TransactionLine", back_populates="account")
-    
-    # Add convenience property to get transactions
-    @property
-    def transactions(self):
-        return [line.transaction for line in self.lines]
+    lines = relationship("TransactionLine", back_populates="account", lazy="raise_on_sql")
 
 class TransactionSource(enum.Enum):
     pos = "pos"
@@ -50,20 +62,20 @@ class TransactionSource(enum.Enum):
     web = "web"
 class Transaction(Base):
     __tablename__ = "transactions"
-    __table_args__ = {'schema': SCHEMA_NAME} 
+    __table_args__ = (
+        # Matches the newest-first listing order, so it is read from the index instead of sorted
+        Index('idx_transactions_date_desc', text('date DESC'), 'id'),
+        {'schema': SCHEMA_NAME}
+    )
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    date = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     description = Column(String, nullable=False)
     source = Column(Enum(TransactionSource, schema=SCHEMA_NAME), nullable=False, default=TransactionSource.manual)
     reference = Column(String, nullable=True)  # invoice ID, POS ticket, etc.
-    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     created_by = Column(String, nullable=True)  # user ID or username
-    lines = relationship("TransactionLine", back_populates="transaction", cascade="all, delete-orphan")
-    
-    # Add convenience property to get accounts
-    @property 
-    def accounts(self):
-        return [line.account for line in self.lines]
+    lines = relationship("TransactionLine", back_populates="transaction", cascade="all, delete-orphan",
+                         passive_deletes=True, lazy="raise_on_sql")
 
 class TransactionLine(Base):
     __tablename__ = "transaction_lines"
@@ -71,14 +83,16 @@ class TransactionLine(Base):
     transaction_id = Column(Integer, ForeignKey(f"{SCHEMA_NAME}.transactions.id", ondelete="CASCADE"), index=True)
     account_id = Column(Integer, ForeignKey(f"{SCHEMA_NAME}.accounts.id"), nullable=False, index=True)
     type = Column(String, nullable=False, index=True)
-    amount = Column(Float, nullable=False)
-    transaction = relationship("Transaction", back_populates="lines")
-    account = relationship("Account", back_populates="lines")
+    amount = Column(Numeric(18, 2), nullable=False)  # exact money; floats can't balance 1/3 splits
+    transaction = relationship("Transaction", back_populates="lines", lazy="raise_on_sql")
+    account = relationship("Account", back_populates="lines", lazy="raise_on_sql")
     
     # Add composite indexes for common queries and schema
     __table_args__ = (
         Index('idx_transaction_account', 'transaction_id', 'account_id'),
         Index('idx_account_type', 'account_id', 'type'),
+        # Covers the account filter + join back to transactions in per-account listings
+        Index('idx_txline_account_tx', 'account_id', 'transaction_id'),
         # Database-level constraints for double-entry validation
         CheckConstraint('amount > 0', name='check_positive_amount'),
         CheckConstraint("type IN ('debit', 'credit')", name='check_valid_type'),
@@ -91,7 +105,7 @@ class TransactionLine(Base):
         if amount <= 0:
             raise ValueError("Transaction line amount must be positive")
         # Round to 2 decimal places for monetary precision
-        return round(float(amount), 2)
+        return to_money(amount)
 
     @validates('type')
     def validate_type(self, key, type_value):
@@ -118,7 +132,7 @@ class AccountingPeriod(Base):
     name = Column(String, nullable=True)  # e.g., "Q1 2025", "December 2025"
     closed_by = Column(String, nullable=True)  # user ID or username who closed it
     closed_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     
     @validates('period_end')
     def validate_period_end(self, key, period_end):
@@ -128,50 +142,59 @@ class AccountingPeriod(Base):
         return period_end
         return type_value
 
+# Resolve relationships at import time so the first request doesn't pay for mapper setup
+configure_mappers()
+
 # CRUD operations for accounts
+def _insert_on_conflict_do_nothing(db: AsyncSession, model):
+    """INSERT for the session's dialect that skips rows violating a unique constraint."""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite_insert(model).on_conflict_do_nothing()
+    return pg_insert(model).on_conflict_do_nothing()
+
 async def create_account(db: AsyncSession, account_data):
     logger.info(f"[ACCOUNT] Creating account: name='{account_data.name}', type={account_data.type}, code='{getattr(account_data, 'code', 'N/A')}'")
     
     try:
-        # Check if account name already exists
-        existing_account = await get_account_by_name(db, account_data.name)
-        if existing_account:
-            logger.warning(f"[WARNING] Account creation failed: Account '{account_data.name}' already exists")
-            raise ValueError(f"Account '{account_data.name}' already exists")
-        
-        # Check if account code already exists
-        existing_code = await get_account_by_code(db, account_data.code)
-        if existing_code:
-            logger.warning(f"[WARNING] Account creation failed: Account code '{account_data.code}' already exists")
-            raise ValueError(f"Account code '{account_data.code}' already exists")
-        
         # Validate and convert account type
         if isinstance(account_data.type, str):
             # Convert string to enum
             try:
                 account_type = AccountType(account_data.type.lower())
-                logger.debug(f"[PROCESSING] Converted string '{account_data.type}' to enum {account_type}")
+                logger.debug("[PROCESSING] Converted string '%s' to enum %s", account_data.type, account_type)
             except ValueError:
                 logger.error(f"[ERROR] Invalid account type: '{account_data.type}'")
                 raise ValueError(f"Invalid account type: '{account_data.type}'. Must be one of: {[e.value for e in AccountType]}")
         else:
             account_type = account_data.type
-            logger.debug(f"[PROCESSING] Using enum account type: {account_type}")
+            logger.debug("[PROCESSING] Using enum account type: %s", account_type)
         
-        account = Account(
-            name=account_data.name,
-            code=account_data.code, 
-            type=account_type,
-            description=account_data.description,
-            is_active=getattr(account_data, 'is_active', True)
+        # Let the unique constraints on name and code detect duplicates; a conflict
+        # inserts nothing and returns no row instead of raising
+        result = await db.execute(
+            _insert_on_conflict_do_nothing(db, Account)
+            .values(
+                name=account_data.name,
+                code=account_data.code,
+                type=account_type,
+                description=account_data.description,
+                is_active=getattr(account_data, 'is_active', True),
+            )
+            .returning(Account)
         )
-        db.add(account)
-        logger.debug(f"[SAVE] Added account to session: {account_data.name}")
+        account = result.scalar_one_or_none()
         
-        await db.commit()
-        logger.debug(f"[SAVE] Committed account to database")
+        if account is None:
+            if await get_account_by_name(db, account_data.name):
+                logger.warning(f"[WARNING] Account creation failed: Account '{account_data.name}' already exists")
+                raise ValueError(f"Account '{account_data.name}' already exists")
+            logger.warning(f"[WARNING] Account creation failed: Account code '{account_data.code}' already exists")
+            raise ValueError(f"Account code '{account_data.code}' already exists")
+        logger.debug("[SAVE] Inserted account: %s", account_data.name)
         
-        await db.refresh(account)
+        await db.commit()
+        # Drop any snapshot left from an account of this name removed outside the API
+        _account_cache.pop(account.name, None)
         logger.info(f"[SUCCESS] Successfully created account: ID={account.id}, Name='{account.name}'")
         
         return account
@@ -185,10 +208,14 @@ async def create_account(db: AsyncSession, account_data):
         await db.rollback()
         raise
 
-async def get_all_accounts(db: AsyncSession):
+async def get_all_accounts(db: AsyncSession, active_only: bool = False):
     logger.debug("[LIST] Fetching all accounts from database")
     try:
-        result = await db.execute(select(Account).order_by(Account.name))
+        query = select(Account).order_by(Account.name)
+        if active_only:
+            # Served in name order straight from idx_accounts_active
+            query = query.where(Account.is_active.is_(True))
+        result = await db.execute(query)
         accounts = result.scalars().all()
         logger.info(f"[SUCCESS] Retrieved {len(accounts)} accounts from database")
         return accounts
@@ -197,37 +224,118 @@ async def get_all_accounts(db: AsyncSession):
         raise
 
 async def get_account_by_name(db: AsyncSession, name: str) -> Optional[Account]:
-    logger.debug(f"[SEARCH] Looking for account by name: '{name}'")
+    logger.debug("[SEARCH] Looking for account by name: '%s'", name)
     try:
         result = await db.execute(select(Account).where(Account.name == name))
         account = result.scalars().first()
         if account:
-            logger.debug(f"[SUCCESS] Found account: ID={account.id}, Name='{account.name}'")
+            logger.debug("[SUCCESS] Found account: ID=%s, Name='%s'", account.id, account.name)
         else:
-            logger.debug(f"[WARNING] Account not found: '{name}'")
+            logger.debug("[WARNING] Account not found: '%s'", name)
         return account
     except Exception as e:
         logger.error(f"[ERROR] Error finding account '{name}': {str(e)}")
         raise
 
+# Detached snapshots of accounts looked up by name. Accounts are not edited or
+# deleted through the API, so entries only go stale through out-of-band changes,
+# which the TTL bounds. Snapshots are merged into the caller's session with
+# load=False, so no ORM instance is ever shared between sessions.
+_account_cache = TTLCache(maxsize=1024, ttl=300)
+
+def _account_snapshot(account: Account) -> Account:
+    snapshot = Account(
+        id=account.id,
+        name=account.name,
+        code=account.code,
+        type=account.type,
+        description=account.description,
+        is_active=account.is_active,
+    )
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+# Account id -> name, so lines that reference accounts by id can share the name cache
+_account_names_by_id = TTLCache(maxsize=1024, ttl=300)
+
+def clear_account_cache():
+    """Forget every cached account, e.g. after accounts were changed directly in the database."""
+    _account_cache.clear()
+    _account_names_by_id.clear()
+
+async def get_accounts_by_names(db: AsyncSession, names) -> Dict[str, Account]:
+    """Fetch every named account, keyed by name; unknown names are left out.
+    
+    Cached accounts are attached without SQL; the rest are fetched in one query.
+    """
+    names = set(names)
+    logger.debug("[SEARCH] Looking up %s accounts by name", len(names))
+    accounts = {}
+    for name in names:
+        snapshot = _account_cache.get(name)
+        if snapshot is not None:
+            accounts[name] = await db.merge(snapshot, load=False)
+    missing = names - accounts.keys()
+    if not missing:
+        return accounts
+    try:
+        result = await db.execute(select(Account).where(Account.name.in_(missing)))
+        for account in result.scalars():
+            accounts[account.name] = account
+            _account_cache[account.name] = _account_snapshot(account)
+            _account_names_by_id[account.id] = account.name
+        return accounts
+    except Exception as e:
+        logger.error(f"[ERROR] Error finding accounts {sorted(missing)}: {str(e)}")
+        raise
+
+async def resolve_line_account_names(db: AsyncSession, lines) -> None:
+    """Fill in account_name on lines that only reference their account by account_id.
+    
+    Known ids are answered from the cache; the rest are resolved in one query.
+    Unknown ids leave account_name unset, which validation reports.
+    """
+    pending = [line for line in lines if getattr(line, 'account_id', None) is not None and not line.account_name]
+    if not pending:
+        return
+    names = {}
+    for line in pending:
+        name = _account_names_by_id.get(line.account_id)
+        if name is not None:
+            names[line.account_id] = name
+    missing = {line.account_id for line in pending} - names.keys()
+    if missing:
+        logger.debug("[SEARCH] Looking up %s accounts by id", len(missing))
+        try:
+            result = await db.execute(select(Account).where(Account.id.in_(missing)))
+        except Exception as e:
+            logger.error(f"[ERROR] Error finding accounts {sorted(missing)}: {str(e)}")
+            raise
+        for account in result.scalars():
+            names[account.id] = account.name
+            _account_cache[account.name] = _account_snapshot(account)
+            _account_names_by_id[account.id] = account.name
+    for line in pending:
+        line.account_name = names.get(line.account_id)
+
 async def get_account_by_code(db: AsyncSession, code: str) -> Optional[Account]:
-    logger.debug(f"[SEARCH] Looking for account by code: '{code}'")
+    logger.debug("[SEARCH] Looking for account by code: '%s'", code)
     try:
         result = await db.execute(select(Account).where(Account.code == code))
         account = result.scalars().first()
         if account:
-            logger.debug(f"[SUCCESS] Found account: ID={account.id}, Code='{account.code}'")
+            logger.debug("[SUCCESS] Found account: ID=%s, Code='%s'", account.id, account.code)
         else:
-            logger.debug(f"[WARNING] Account code not found: '{code}'")
+            logger.debug("[WARNING] Account code not found: '%s'", code)
         return account
     except Exception as e:
         logger.error(f"[ERROR] Error finding account by code '{code}': {str(e)}")
         raise
 
 # Period management functions
-async def get_period_for_date(db: AsyncSession, date: datetime) -> Optional[AccountingPeriod]:
-    """Get the accounting period that contains the given date."""
-    logger.debug(f"[PERIOD] Checking for period containing date: {date}")
+async def get_period_for_date(db: AsyncSession, date) -> Optional[AccountingPeriod]:
+    """Get the accounting period that contains the given date (a datetime or SQL expression such as func.now())."""
+    logger.debug("[PERIOD] Checking for period containing date: %s", date)
     try:
         result = await db.execute(
             select(AccountingPeriod).where(
@@ -239,52 +347,83 @@ async def get_period_for_date(db: AsyncSession, date: datetime) -> Optional[Acco
         )
         period = result.scalars().first()
         if period:
-            logger.debug(f"[PERIOD] Found period: {period.name} (Status: {period.status.value})")
+            logger.debug("[PERIOD] Found period: %s (Status: %s)", period.name, period.status.value)
         return period
     except Exception as e:
         logger.error(f"[ERROR] Error finding period for date: {str(e)}")
         raise
 
 # CRUD operations for transactions
+
+# Lines and their accounts are eager-loaded; any other relationship access on the
+# loaded graph (e.g. Account.lines) raises instead of issuing a per-row SELECT
+_TRANSACTION_LOAD_OPTIONS = (
+    selectinload(Transaction.lines).joinedload(TransactionLine.account, innerjoin=True).raiseload("*"),
+    raiseload("*"),
+)
+
 async def get_all_transactions(db: AsyncSession):
     logger.debug("[DATABASE] Fetching all transactions from database with relationships")
     try:
         result = await db.execute(
-            select(Transaction).options(
-                selectinload(Transaction.lines).selectinload(TransactionLine.account)
-            ).order_by(Transaction.date.desc())
+            select(Transaction).options(*_TRANSACTION_LOAD_OPTIONS).order_by(Transaction.date.desc(), Transaction.id)
         )
         transactions = result.scalars().unique().all()
         logger.info(f"[SUCCESS] Retrieved {len(transactions)} transactions from database")
         
         # Log summary of transactions
-        for tx in transactions:
-            logger.debug(f"[DOCUMENT] Transaction ID={tx.id}: '{tx.description}' - {len(tx.lines)} lines")
+        if logger.isEnabledFor(logging.DEBUG):
+            for tx in transactions:
+                logger.debug("[DOCUMENT] Transaction ID=%s: '%s' - %s lines", tx.id, tx.description, len(tx.lines))
         
         return transactions
     except Exception as e:
         logger.error(f"[ERROR] Error fetching transactions: {str(e)}")
         raise
 
+# Journal entries at least this large (bulk imports, period close) are written with COPY
+COPY_THRESHOLD = 100
+
+_LINE_COPY_COLUMNS = ("transaction_id", "account_id", "type", "amount")
+
+async def _copy_lines(db: AsyncSession, line_rows: List[dict]):
+    """Write transaction lines through asyncpg's COPY protocol on the session's connection"""
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        TransactionLine.__table__.name,
+        records=[tuple(row[col] for col in _LINE_COPY_COLUMNS) for row in line_rows],
+        columns=list(_LINE_COPY_COLUMNS),
+        schema_name=TransactionLine.__table__.schema,
+    )
+
 async def create_transaction(db: AsyncSession, transaction_data):
     logger.info(f"[TRANSACTION] Starting transaction creation: '{transaction_data.description}'")
-    logger.debug(f"[DATE] Transaction date: {transaction_data.date}")
-    logger.debug(f"[DETAILS] Transaction source: {transaction_data.source}")
-    logger.debug(f"🔖 Transaction reference: {transaction_data.reference}")
+    logger.debug("[DATE] Transaction date: %s", getattr(transaction_data, 'date', None))
+    logger.debug("[DETAILS] Transaction source: %s", transaction_data.source)
+    logger.debug("🔖 Transaction reference: %s", transaction_data.reference)
     
-    # Check if transaction date falls within a closed period
-    transaction_date = transaction_data.date
+    # Handle timezone conversion for date
+    transaction_date = getattr(transaction_data, 'date', None)
     if hasattr(transaction_date, 'tzinfo') and transaction_date.tzinfo is not None:
+        # Convert timezone-aware datetime to naive UTC
         transaction_date = transaction_date.replace(tzinfo=None)
+        logger.debug("[TIMEZONE] Converted timezone-aware date to naive: %s", transaction_date)
     
-    closed_period = await get_period_for_date(db, transaction_date)
+    # Check if transaction date falls within a closed period. Undated transactions
+    # are stamped by the database, so check them against the database clock too.
+    closed_period = await get_period_for_date(db, transaction_date if transaction_date is not None else func.now())
     if closed_period and closed_period.status in (PeriodStatus.CLOSED, PeriodStatus.LOCKED):
         error_msg = f"Cannot create transaction: Period from {closed_period.period_start.date()} to {closed_period.period_end.date()} is {closed_period.status.value}"
         logger.error(f"[PERIOD_ERROR] {error_msg}")
         raise ValueError(error_msg)
     
+    # Resolve every referenced account in one query, shared by validation and the inserts
+    await resolve_line_account_names(db, transaction_data.lines)
+    accounts = await get_accounts_by_names(db, (line.account_name for line in transaction_data.lines if line.account_name))
+    
     # Enhanced validation with detailed error reporting
-    validation_result = await validate_transaction_data(db, transaction_data)
+    validation_result = await validate_transaction_data(db, transaction_data, accounts=accounts)
     if not validation_result.is_valid:
         error_msg = f"Transaction validation failed: {', '.join(validation_result.errors)}"
         logger.error(f"[ERROR] {error_msg}")
@@ -293,65 +432,80 @@ async def create_transaction(db: AsyncSession, transaction_data):
     logger.info(f"[SUCCESS] Transaction validation passed")
     
     try:
-        # Handle timezone conversion for date
-        transaction_date = transaction_data.date
-        if hasattr(transaction_date, 'tzinfo') and transaction_date.tzinfo is not None:
-            # Convert timezone-aware datetime to naive UTC
-            transaction_date = transaction_date.replace(tzinfo=None)
-            logger.debug(f"[TIMEZONE] Converted timezone-aware date to naive: {transaction_date}")
-        
         # Create transaction object
         transaction = Transaction(
-            date=transaction_date,
             description=transaction_data.description,
             source=transaction_data.source if hasattr(transaction_data, 'source') else TransactionSource.manual,
             reference=getattr(transaction_data, 'reference', None),
             created_by=getattr(transaction_data, 'created_by', None),
         )
+        if transaction_date is not None:
+            transaction.date = transaction_date
         db.add(transaction)
-        logger.debug(f"[SAVE] Added transaction to session")
+        logger.debug("[SAVE] Added transaction to session")
         
         await db.flush()  # get transaction.id
-        logger.debug(f"🆆 Transaction flushed, received ID={transaction.id}")
+        logger.debug("🆆 Transaction flushed, received ID=%s", transaction.id)
         
         # Process transaction lines
         logger.info(f"[DETAILS] Processing {len(transaction_data.lines)} transaction lines")
         
+        line_rows = []
         for i, line in enumerate(transaction_data.lines, 1):
-            logger.debug(f"[DETAILS] Line {i}: Account='{line.account_name}', Type={line.type}, Amount={line.amount}")
+            logger.debug("[DETAILS] Line %s: Account='%s', Type=%s, Amount=%s", i, line.account_name, line.type, line.amount)
             
-            # Get account by name
-            account = await get_account_by_name(db, line.account_name)
-            if not account:
+            account = accounts.get(line.account_name)
+            if account is None:
                 error_msg = f"Account '{line.account_name}' not found"
                 logger.error(f"[ERROR] {error_msg}")
                 raise ValueError(error_msg)
             
-            logger.debug(f"[SUCCESS] Found account: ID={account.id}, Name='{account.name}', Type={account.type}")
-            
-            transaction_line = TransactionLine(
-                transaction_id=transaction.id,
-                account_id=account.id,
-                type=line.type,
-                amount=line.amount
-            )
-            db.add(transaction_line)
-            logger.debug(f"[SAVE] Added transaction line to session")
+            # Core INSERT skips the @validates hooks; type and sign were checked by
+            # validate_transaction_data above, so only the 2dp rounding is repeated here
+            line_rows.append({
+                "transaction_id": transaction.id,
+                "account_id": account.id,
+                "type": line.type,
+                "amount": to_money(line.amount),
+            })
+        
+        if len(line_rows) >= COPY_THRESHOLD and db.bind.dialect.driver == "asyncpg":
+            await _copy_lines(db, line_rows)
+            lines = None
+            logger.debug("[SAVE] Copied %s transaction lines", len(line_rows))
+        else:
+            # One multi-row INSERT instead of a unit-of-work INSERT per line;
+            # RETURNING hands back the persisted lines so they needn't be re-read
+            lines = (await db.execute(
+                insert(TransactionLine).returning(TransactionLine), line_rows
+            )).scalars().all()
+            logger.debug("[SAVE] Inserted %s transaction lines", len(line_rows))
         
         await db.commit()
         logger.info(f"[SUCCESS] Transaction committed to database")
         
-        # Re-query with selectinload to ensure lines and accounts are loaded
-        logger.debug(f"[PROCESSING] Re-querying transaction with relationships")
-        result = await db.execute(
-            select(Transaction).options(
-                selectinload(Transaction.lines).selectinload(TransactionLine.account)
-            ).where(Transaction.id == transaction.id)
-        )
-        transaction_with_lines = result.scalars().first()
+        if lines is None:
+            # COPY returns nothing, so load what it wrote
+            logger.debug("[PROCESSING] Re-querying transaction with relationships")
+            result = await db.execute(
+                select(Transaction).options(
+                    selectinload(Transaction.lines).joinedload(TransactionLine.account, innerjoin=True)
+                ).where(Transaction.id == transaction.id)
+            )
+            transaction_with_lines = result.scalars().first()
+        else:
+            # Wire up the relationships from what is already in memory
+            accounts_by_id = {account.id: account for account in accounts.values()}
+            for line in lines:
+                set_committed_value(line, "account", accounts_by_id[line.account_id])
+                set_committed_value(line, "transaction", transaction)
+            set_committed_value(transaction, "lines", lines)
+            transaction_with_lines = transaction
         
         # Final validation after commit
-        post_commit_validation = await validate_transaction_integrity(db, transaction_with_lines.id)
+        post_commit_validation = await validate_transaction_integrity(
+            db, transaction_with_lines.id, transaction=transaction_with_lines
+        )
         if not post_commit_validation.is_valid:
             logger.error(f"[ERROR] Post-commit validation failed: {post_commit_validation.errors}")
             # This should not happen if pre-validation worked correctly
@@ -369,12 +523,10 @@ async def create_transaction(db: AsyncSession, transaction_data):
         raise
 
 async def get_transaction_by_id(db: AsyncSession, transaction_id: int) -> Optional[Transaction]:
-    logger.debug(f"[SEARCH] Fetching transaction by ID: {transaction_id}")
+    logger.debug("[SEARCH] Fetching transaction by ID: %s", transaction_id)
     try:
         result = await db.execute(
-            select(Transaction).options(
-                selectinload(Transaction.lines).selectinload(TransactionLine.account)
-            ).where(Transaction.id == transaction_id)
+            select(Transaction).options(*_TRANSACTION_LOAD_OPTIONS).where(Transaction.id == transaction_id)
         )
         transaction = result.scalars().first()
         
@@ -396,22 +548,45 @@ async def get_transactions_for_account(db: AsyncSession, account_name: str):
         .join(TransactionLine)
         .join(Account)
         .where(Account.name == account_name)
-        .options(selectinload(Transaction.lines).selectinload(TransactionLine.account))
+        .options(selectinload(Transaction.lines).joinedload(TransactionLine.account, innerjoin=True))
     )
     return result.scalars().unique().all()
 
+async def get_accounts_for_transaction(db: AsyncSession, transaction_id: int):
+    """Get the distinct accounts a transaction posts to"""
+    result = await db.execute(
+        select(Account)
+        .join(TransactionLine)
+        .where(TransactionLine.transaction_id == transaction_id)
+        .distinct()
+        .order_by(Account.name)
+    )
+    return result.scalars().all()
+
 async def get_account_balance(db: AsyncSession, account_name: str) -> float:
     """Calculate account balance (debits - credits for assets/expenses, credits - debits for others)"""
-    account = await get_account_by_name(db, account_name)
-    if not account:
+    # Sum in the database rather than loading every line of the account
+    result = await db.execute(
+        select(
+            Account.type,
+            func.coalesce(func.sum(case((TransactionLine.type == 'debit', TransactionLine.amount), else_=0)), 0).label('debit_total'),
+            func.coalesce(func.sum(case((TransactionLine.type == 'credit', TransactionLine.amount), else_=0)), 0).label('credit_total'),
+        )
+        .select_from(Account)
+        .outerjoin(TransactionLine, TransactionLine.account_id == Account.id)
+        .where(Account.name == account_name)
+        .group_by(Account.id, Account.type)
+    )
+    row = result.first()
+    if row is None:
         return 0.0
     
-    debit_total = sum(line.amount for line in account.lines if line.type == 'debit')
-    credit_total = sum(line.amount for line in account.lines if line.type == 'credit')
+    debit_total = float(row.debit_total)
+    credit_total = float(row.credit_total)
     
     # For assets and expenses: positive balance = debit balance
     # For liabilities, equity, income: positive balance = credit balance
-    if account.type in [AccountType.ASSET, AccountType.EXPENSE]:
+    if row.type in [AccountType.ASSET, AccountType.EXPENSE]:
         return debit_total - credit_total
     else:
         return credit_total - debit_total
@@ -422,15 +597,19 @@ async def get_account_transactions_optimized(db: AsyncSession, account_id: int):
         select(Transaction)
         .join(TransactionLine, Transaction.id == TransactionLine.transaction_id)
         .where(TransactionLine.account_id == account_id)
-        .options(selectinload(Transaction.lines).selectinload(TransactionLine.account))
+        .options(selectinload(Transaction.lines).joinedload(TransactionLine.account, innerjoin=True))
         .order_by(Transaction.date.desc())
     )
     return result.scalars().unique().all()
 
 async def get_account_balance_optimized(db: AsyncSession, account_id: int) -> dict:
-    """Get account balance using optimized DB query"""
+    """Get account balance using optimized DB query, signed by the account's normal side"""
+    # The type comes from a primary-key subquery in the same statement, so the
+    # lines are scanned once on idx_account_type with no join to accounts
+    account_type = select(Account.type).where(Account.id == account_id).scalar_subquery()
     result = await db.execute(
         select(
+            account_type.label('account_type'),
             func.sum(case((TransactionLine.type == 'debit', TransactionLine.amount), else_=0)).label('debit_total'),
             func.sum(case((TransactionLine.type == 'credit', TransactionLine.amount), else_=0)).label('credit_total')
         )
@@ -438,13 +617,20 @@ async def get_account_balance_optimized(db: AsyncSession, account_id: int) -> di
     )
     
     row = result.first()
-    debit_total = row.debit_total or 0.0
-    credit_total = row.credit_total or 0.0
+    debit_total = float(row.debit_total or 0)
+    credit_total = float(row.credit_total or 0)
+    
+    # For assets and expenses: positive balance = debit balance
+    # For liabilities, equity, income: positive balance = credit balance
+    if row.account_type in (AccountType.ASSET, AccountType.EXPENSE):
+        balance = debit_total - credit_total
+    else:
+        balance = credit_total - debit_total
     
     return {
         'debit_total': debit_total,
         'credit_total': credit_total,
-        'balance': debit_total - credit_total  # Adjust based on account type
+        'balance': balance
     }
 
 # ============================================================================
@@ -465,10 +651,19 @@ class ValidationResult:
     def add_warning(self, warning: str):
         self.warnings.append(warning)
 
-async def validate_transaction_data(db: AsyncSession, transaction_data) -> ValidationResult:
+def line_totals(lines) -> Tuple[Decimal, Decimal]:
+    """Sum debit and credit amounts of transaction lines in one pass, exactly (as Decimal)."""
+    totals = {'debit': Decimal('0.00'), 'credit': Decimal('0.00')}
+    for line in lines:
+        totals[line.type] += Decimal(str(line.amount))
+    return totals['debit'], totals['credit']
+
+async def validate_transaction_data(db: AsyncSession, transaction_data, accounts: Optional[Dict[str, Account]] = None) -> ValidationResult:
     """
     Comprehensive validation for transaction data before creation
     Implements enterprise-grade double-entry bookkeeping validation
+    
+    ``accounts`` maps account name to Account for the lines; it is fetched here when not given.
     """
     logger.debug("[VALIDATION] Starting comprehensive transaction validation")
     result = ValidationResult()
@@ -478,6 +673,12 @@ async def validate_transaction_data(db: AsyncSession, transaction_data) -> Valid
         result.add_error("Transaction must have at least one line")
         return result
     
+    if accounts is None:
+        await resolve_line_account_names(db, transaction_data.lines)
+        accounts = await get_accounts_by_names(
+            db, (line.account_name for line in transaction_data.lines if getattr(line, 'account_name', None))
+        )
+    
     if len(transaction_data.lines) < 2:
         result.add_error("Double-entry transactions must have at least 2 lines")
     
@@ -493,7 +694,10 @@ async def validate_transaction_data(db: AsyncSession, transaction_data) -> Valid
     for i, line in enumerate(transaction_data.lines, 1):
         # Check required fields
         if not hasattr(line, 'account_name') or not line.account_name:
-            result.add_error(f"Line {i}: Account name is required")
+            if getattr(line, 'account_id', None) is not None:
+                result.add_error(f"Line {i}: Account ID {line.account_id} does not exist")
+            else:
+                result.add_error(f"Line {i}: Account name is required")
             continue
         
         if not hasattr(line, 'type') or line.type not in ('debit', 'credit'):
@@ -505,7 +709,7 @@ async def validate_transaction_data(db: AsyncSession, transaction_data) -> Valid
             continue
         
         # Validate account exists
-        account = await get_account_by_name(db, line.account_name)
+        account = accounts.get(line.account_name)
         if not account:
             result.add_error(f"Line {i}: Account '{line.account_name}' does not exist")
             continue
@@ -516,7 +720,7 @@ async def validate_transaction_data(db: AsyncSession, transaction_data) -> Valid
         
         # Convert to Decimal for precise monetary calculation
         try:
-            amount = Decimal(str(line.amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            amount = to_money(line.amount)
         except:
             result.add_error(f"Line {i}: Invalid amount format")
             continue
@@ -542,7 +746,7 @@ async def validate_transaction_data(db: AsyncSession, transaction_data) -> Valid
         result.add_warning("Transaction involves only one account (internal transfer)")
     
     # 6. Validate accounting equation implications
-    await validate_accounting_equation_impact(db, transaction_data, result)
+    await validate_accounting_equation_impact(db, transaction_data, result, accounts=accounts)
     
     logger.info(f"[VALIDATION] Validation complete: {'PASSED' if result.is_valid else 'FAILED'}")
     if result.errors:
@@ -552,19 +756,21 @@ async def validate_transaction_data(db: AsyncSession, transaction_data) -> Valid
     
     return result
 
-async def validate_accounting_equation_impact(db: AsyncSession, transaction_data, result: ValidationResult):
+async def validate_accounting_equation_impact(db: AsyncSession, transaction_data, result: ValidationResult, accounts: Optional[Dict[str, Account]] = None):
     """
     Validate that the transaction maintains the fundamental accounting equation:
     Assets = Liabilities + Equity
     """
     logger.debug("[VALIDATION] Checking accounting equation impact")
+    if accounts is None:
+        accounts = await get_accounts_by_names(db, (line.account_name for line in transaction_data.lines))
     
     asset_change = Decimal('0.00')
     liability_change = Decimal('0.00')
     equity_change = Decimal('0.00')
     
     for line in transaction_data.lines:
-        account = await get_account_by_name(db, line.account_name)
+        account = accounts.get(line.account_name)
         if not account:
             continue  # Already handled in main validation
         
@@ -609,17 +815,21 @@ async def validate_accounting_equation_impact(db: AsyncSession, transaction_data
     if abs(equation_balance) > Decimal('0.01'):  # Allow for small rounding differences
         result.add_warning(f"Accounting equation impact: Assets Δ{asset_change} ≠ Liabilities Δ{liability_change} + Equity Δ{equity_change}")
     
-    logger.debug(f"[VALIDATION] Equation impact: Assets±{asset_change}, Liabilities±{liability_change}, Equity±{equity_change}")
+    logger.debug("[VALIDATION] Equation impact: Assets±%s, Liabilities±%s, Equity±%s", asset_change, liability_change, equity_change)
 
-async def validate_transaction_integrity(db: AsyncSession, transaction_id: int) -> ValidationResult:
+async def validate_transaction_integrity(db: AsyncSession, transaction_id: int, transaction: Optional[Transaction] = None) -> ValidationResult:
     """
     Post-commit validation to ensure transaction integrity in the database
+    
+    ``transaction`` may be passed when its lines and accounts are already loaded
+    from the database (e.g. via RETURNING), which skips re-reading them.
     """
-    logger.debug(f"[VALIDATION] Performing post-commit integrity check for transaction {transaction_id}")
+    logger.debug("[VALIDATION] Performing post-commit integrity check for transaction %s", transaction_id)
     result = ValidationResult()
     
     # Get transaction with lines
-    transaction = await get_transaction_by_id(db, transaction_id)
+    if transaction is None:
+        transaction = await get_transaction_by_id(db, transaction_id)
     if not transaction:
         result.add_error(f"Transaction {transaction_id} not found")
         return result
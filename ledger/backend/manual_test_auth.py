@@ -5,18 +5,22 @@ Test script for MG-ERP Authentication System
 import asyncio
 import aiohttp
 import json
+import time
 from typing import Dict, Any
 
-BASE_URL = "http://localhost:8000/api/v1"
+SERVER_URL = "http://localhost:8000"
+API_PREFIX = "/api/v1"
 
 class AuthTester:
     def __init__(self):
         self.session = None
         self.token = None
-        self.base_url = BASE_URL
+        self.base_url = API_PREFIX
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Keep-alive pool so repeated and concurrent requests reuse connections
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=50, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(base_url=SERVER_URL, connector=connector)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -67,6 +71,25 @@ class AuthTester:
                 print(f"[ERROR] Failed to access accounts: {result}")
             return result
     
+    async def list_accounts_concurrently(self, count: int = 20) -> Dict[int, int]:
+        """Fire several accounts requests at once over the shared connection pool."""
+        print(f"[TEST] Sending {count} concurrent accounts requests...")
+        
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        
+        async def fetch() -> int:
+            async with self.session.get(f"{self.base_url}/accounts", headers=headers) as response:
+                await response.read()
+                return response.status
+        
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*[fetch() for _ in range(count)])
+        elapsed = time.perf_counter() - started
+        
+        counts = {status: statuses.count(status) for status in set(statuses)}
+        print(f"[SUCCESS] {count} requests in {elapsed:.2f}s, status counts: {counts}")
+        return counts
+    
     async def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Test creating a new user (admin only)."""
         print(f"[TEST] Creating new user: {user_data.get('username')}")
@@ -92,7 +115,7 @@ class AuthTester:
         """Test basic health check endpoint."""
         print("[TEST] Checking API health...")
         
-        async with self.session.get("http://localhost:8000/health") as response:
+        async with self.session.get("/health") as response:
             result = await response.json()
             if response.status == 200:
                 print(f"[SUCCESS] API is healthy: {result.get('status')}")
@@ -130,7 +153,12 @@ async def main():
             await tester.list_accounts()
             print()
             
-            # Test 6: Create new user (admin only)
+            # Test 6: Concurrent authenticated access
+            print("=== Test: Concurrent Access ===")
+            await tester.list_accounts_concurrently()
+            print()
+            
+            # Test 7: Create new user (admin only)
             print("=== Test: Create New User ===")
             new_user_data = {
                 "username": "testuser",
@@ -142,7 +170,7 @@ async def main():
             await tester.create_user(new_user_data)
             print()
             
-            # Test 7: Login with new user
+            # Test 8: Login with new user
             print("=== Test: New User Login ===")
             await tester.login("testuser", "testpass123")
             if tester.token:
@@ -150,7 +178,7 @@ async def main():
                 await tester.list_accounts()  # Should work if user role has account:read permission
 
 if __name__ == "__main__":
-    print("Make sure the FastAPI server is running on http://localhost:8000")
+    print(f"Make sure the FastAPI server is running on {SERVER_URL}")
     print("You can start it with: uvicorn app.main:app --reload")
     print()
     
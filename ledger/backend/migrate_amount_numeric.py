@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Convert transaction line amounts from float to NUMERIC(18, 2)
+
+create_all does not alter existing tables, so databases created while
+transaction_lines.amount was a double precision column need this once.
+Existing values are rounded half away from zero to cents.
+"""
+
+import asyncio
+import logging
+from sqlalchemy import text
+from app.config import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def migrate_amount_numeric():
+    """Change ledger.transaction_lines.amount to NUMERIC(18, 2) if it isn't already"""
+
+    async with engine.begin() as conn:
+        logger.info("Checking transaction_lines.amount column type...")
+        column_result = await conn.execute(text(
+            "SELECT data_type, numeric_precision, numeric_scale FROM information_schema.columns "
+            "WHERE table_schema = 'ledger' AND table_name = 'transaction_lines' AND column_name = 'amount'"
+        ))
+        column = column_result.first()
+
+        if column is None:
+            logger.info("ledger.transaction_lines does not exist yet; create_all will create it as NUMERIC")
+            return
+
+        if column.data_type == "numeric" and (column.numeric_precision, column.numeric_scale) == (18, 2):
+            logger.info("Amount column is already NUMERIC(18, 2); no action needed")
+            return
+
+        logger.info(f"Converting amount from {column.data_type} to NUMERIC(18, 2)...")
+        await conn.execute(text(
+            "ALTER TABLE ledger.transaction_lines "
+            "ALTER COLUMN amount TYPE NUMERIC(18, 2) USING round(amount::numeric, 2)"
+        ))
+        logger.info("Amount column converted")
+
+if __name__ == "__main__":
+    asyncio.run(migrate_amount_numeric())
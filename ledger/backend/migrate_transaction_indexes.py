@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Create the transaction and account listing indexes on an existing ledger database
+
+create_all only creates indexes together with new tables. This builds
+them CONCURRENTLY so writes to the ledger are not blocked meanwhile.
+"""
+
+import asyncio
+import logging
+from sqlalchemy import text
+from app.config import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "idx_transactions_date_desc": "ON ledger.transactions (date DESC, id)",
+    "idx_txline_account_tx": "ON ledger.transaction_lines (account_id, transaction_id)",
+    "idx_accounts_active": "ON ledger.accounts (name) WHERE is_active",
+}
+
+async def migrate_transaction_indexes():
+    """Create any missing listing indexes"""
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for name, definition in INDEXES.items():
+            logger.info(f"Creating index {name}...")
+            await conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+            logger.info(f"Index {name} is in place")
+
+if __name__ == "__main__":
+    asyncio.run(migrate_transaction_indexes())
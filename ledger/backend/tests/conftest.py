@@ -1,11 +1,13 @@
 import pytest
 import pytest_asyncio
 import asyncio
+import contextlib
 import sys
 import os
 from pathlib import Path
 from httpx import AsyncClient
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -68,7 +70,7 @@ config.SessionLocal = TestAsyncSession
 # Now import app components
 from app.main import app
 from app.dependencies import get_db
-from app.services.ledger import Base
+from app.services.ledger import Base, clear_account_cache
 
 # Import all models to ensure they're registered with Base
 from app.services.ledger import Account, Transaction, TransactionLine
@@ -120,6 +122,8 @@ async def db_session():
     This fixture is autouse=True so every test gets a clean database.
     """
     # Clean up BEFORE test to ensure clean state
+    # Accounts are recreated with new ids, so cached account lookups must go too
+    clear_account_cache()
     try:
         async with test_engine.begin() as conn:
             if is_postgres:
@@ -148,6 +152,31 @@ async def db_session():
             await session.close()
 
 
+@pytest.fixture
+def count_queries():
+    """Context manager collecting every SQL statement the test engine executes.
+    
+    Usage:
+        with count_queries() as queries:
+            await get_all_transactions(db_session)
+        assert len(queries) == 3
+    """
+    @contextlib.contextmanager
+    def _count_queries():
+        queries = []
+        
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+        
+        event.listen(test_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            yield queries
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", listener)
+    
+    return _count_queries
+
+
 # Override the get_db dependency to use per-test session
 async def override_get_db():
     """Override database dependency with test session."""
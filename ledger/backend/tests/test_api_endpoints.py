@@ -257,6 +257,25 @@ class TestAccountEndpoints:
         
         assert response.status_code == 401  # HTTPBearer returns 401 for missing credentials
 
+    def test_list_accounts_active_only(self, auth_headers):
+        """Test that active_only leaves out inactive accounts."""
+        client.post("/api/v1/accounts", headers=auth_headers, json={
+            "name": "Open Account", "type": "asset", "code": "1101", "is_active": True
+        })
+        client.post("/api/v1/accounts", headers=auth_headers, json={
+            "name": "Closed Account", "type": "asset", "code": "1102", "is_active": False
+        })
+
+        response = client.get("/api/v1/accounts?active_only=true", headers=auth_headers)
+
+        assert response.status_code == 200
+        names = [account["name"] for account in response.json()]
+        assert "Open Account" in names
+        assert "Closed Account" not in names
+
+        all_names = [account["name"] for account in client.get("/api/v1/accounts", headers=auth_headers).json()]
+        assert "Closed Account" in all_names
+
     def test_create_account_success(self, auth_headers):
         """Test creating a new account successfully."""
         account_data = {
@@ -425,6 +444,48 @@ class TestTransactionEndpoints:
         assert data["reference"] == "TEST-001"
         assert len(data["lines"]) == 2
         assert "id" in data
+        assert data["date"]  # stamped by the database when not supplied
+
+    def test_create_transaction_by_account_id(self, auth_headers):
+        """Test creating a transaction whose lines reference accounts by ID."""
+        cash = client.post("/api/v1/accounts", headers=auth_headers, json={
+            "name": "ID Cash", "type": "asset", "code": "1110"
+        }).json()
+        revenue = client.post("/api/v1/accounts", headers=auth_headers, json={
+            "name": "ID Revenue", "type": "income", "code": "4110"
+        }).json()
+
+        response = client.post("/api/v1/transactions", headers=auth_headers, json={
+            "description": "Lines by account ID",
+            "lines": [
+                {"account_id": cash["id"], "type": "debit", "amount": 75.00},
+                {"account_id": revenue["id"], "type": "credit", "amount": 75.00}
+            ]
+        })
+
+        assert response.status_code == 200
+        assert {line["account_name"] for line in response.json()["lines"]} == {"ID Cash", "ID Revenue"}
+
+        response = client.post("/api/v1/transactions", headers=auth_headers, json={
+            "description": "Unknown account ID",
+            "lines": [
+                {"account_id": 999999, "type": "debit", "amount": 75.00},
+                {"account_id": revenue["id"], "type": "credit", "amount": 75.00}
+            ]
+        })
+        assert response.status_code == 400
+        assert "999999" in response.json()["detail"]
+
+    def test_create_transaction_without_account_reference(self, auth_headers):
+        """Test that a line needs either account_id or account_name."""
+        response = client.post("/api/v1/transactions", headers=auth_headers, json={
+            "description": "No account",
+            "lines": [
+                {"type": "debit", "amount": 10.00},
+                {"account_name": "Test Cash", "type": "credit", "amount": 10.00}
+            ]
+        })
+        assert response.status_code == 422
 
     def test_create_transaction_unbalanced(self, auth_headers):
         """Test creating unbalanced transaction (should fail)."""
@@ -5,6 +5,7 @@ Tests enterprise-grade validation features and accounting equation integrity.
 import pytest
 import pytest_asyncio
 from decimal import Decimal
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 
@@ -15,6 +16,13 @@ from app.services.ledger import (
     validate_all_transactions_integrity,
     get_accounting_equation_status,
     create_transaction,
+    get_transaction_by_id,
+    get_all_transactions,
+    get_transactions_for_account,
+    get_accounts_for_transaction,
+    get_account_balance,
+    get_account_balance_optimized,
+    clear_account_cache,
     ValidationResult,
     AccountType,
     TransactionSource,
@@ -414,4 +422,152 @@ class TestValidationResult:
         
         assert not result.is_valid
         assert len(result.errors) == 2
-        assert len(result.warnings) == 2
\ No newline at end of file
+        assert len(result.warnings) == 2
+
+
+class TestTransactionLoading:
+    """Test eager-loading guards on transaction queries"""
+
+    @pytest.mark.asyncio
+    async def test_loaded_graph_raises_on_lazy_access(self, db_session: AsyncSession, setup_test_accounts):
+        """Test that lines and accounts are loaded and anything else raises instead of lazy loading"""
+        
+        transaction_data = MockTransactionData(
+            description="Eager loading guard",
+            lines=[
+                MockTransactionLine("Cash", "debit", 250.00),
+                MockTransactionLine("Sales Revenue", "credit", 250.00),
+            ]
+        )
+        created_transaction = await create_transaction(db_session, transaction_data)
+        db_session.expunge_all()
+        
+        transaction = await get_transaction_by_id(db_session, created_transaction.id)
+        assert {line.account.name for line in transaction.lines} == {"Cash", "Sales Revenue"}
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            transaction.lines[0].account.lines
+        
+        db_session.expunge_all()
+        transactions = await get_all_transactions(db_session)
+        assert len(transactions[0].lines) == 2
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            transactions[0].lines[0].account.lines
+
+    @pytest.mark.asyncio
+    async def test_related_lookups_are_single_queries(self, db_session: AsyncSession, setup_test_accounts, count_queries):
+        """Test that transactions per account and accounts per transaction each take one query"""
+        
+        created = await create_transaction(db_session, MockTransactionData("Split sale", [
+            MockTransactionLine("Cash", "debit", 30.00),
+            MockTransactionLine("Cash", "debit", 20.00),
+            MockTransactionLine("Sales Revenue", "credit", 50.00),
+        ]))
+        db_session.expunge_all()
+        
+        with count_queries() as queries:
+            accounts = await get_accounts_for_transaction(db_session, created.id)
+        assert [account.name for account in accounts] == ["Cash", "Sales Revenue"]
+        assert len(queries) == 1
+        
+        db_session.expunge_all()
+        transactions = await get_transactions_for_account(db_session, "Cash")
+        assert [transaction.id for transaction in transactions] == [created.id]
+        assert len(transactions[0].lines) == 3
+
+    @pytest.mark.asyncio
+    async def test_listing_query_count_does_not_grow_with_rows(self, db_session: AsyncSession, setup_test_accounts, count_queries):
+        """Test that listing transactions issues a fixed number of statements"""
+        
+        for description, pairs in (("Two lines", 1), ("Eight lines", 4)):
+            lines = []
+            for _ in range(pairs):
+                lines.append(MockTransactionLine("Cash", "debit", 10.00))
+                lines.append(MockTransactionLine("Sales Revenue", "credit", 10.00))
+            await create_transaction(db_session, MockTransactionData(description, lines))
+        
+        db_session.expunge_all()
+        with count_queries() as queries:
+            transactions = await get_all_transactions(db_session)
+        assert len(transactions) == 2
+        # transactions, then their lines joined to the lines' accounts
+        assert len(queries) == 2
+
+    @pytest.mark.asyncio
+    async def test_create_query_count_does_not_grow_with_lines(self, db_session: AsyncSession, setup_test_accounts, count_queries):
+        """Test that creating a transaction resolves its accounts without a query per line"""
+        
+        counts = []
+        for description, pairs in (("Two lines", 1), ("Eight lines", 4)):
+            lines = []
+            for _ in range(pairs):
+                lines.append(MockTransactionLine("Cash", "debit", 10.00))
+                lines.append(MockTransactionLine("Sales Revenue", "credit", 10.00))
+            clear_account_cache()
+            with count_queries() as queries:
+                await create_transaction(db_session, MockTransactionData(description, lines))
+            counts.append(len(queries))
+        assert counts[0] == counts[1]
+
+    @pytest.mark.asyncio
+    async def test_cached_accounts_skip_the_lookup(self, db_session: AsyncSession, setup_test_accounts, count_queries):
+        """Test that a repeat posting to the same accounts resolves them from the cache"""
+        
+        def sale():
+            return MockTransactionData("Cash sale", [
+                MockTransactionLine("Cash", "debit", 40.00),
+                MockTransactionLine("Sales Revenue", "credit", 40.00),
+            ])
+        
+        clear_account_cache()
+        with count_queries() as cold:
+            await create_transaction(db_session, sale())
+        db_session.expunge_all()
+        with count_queries() as warm:
+            created = await create_transaction(db_session, sale())
+        assert len(warm) == len(cold) - 1
+        assert {line.account.name for line in created.lines} == {"Cash", "Sales Revenue"}
+
+
+class TestAccountBalance:
+    """Test SQL-side account balance aggregation"""
+
+    @pytest.mark.asyncio
+    async def test_balance_follows_normal_side(self, db_session: AsyncSession, setup_test_accounts, count_queries):
+        """Test that balances are signed by account type and computed in one query"""
+        
+        for amount in (300.00, 200.00):
+            await create_transaction(db_session, MockTransactionData(
+                description="Cash sale",
+                lines=[
+                    MockTransactionLine("Cash", "debit", amount),
+                    MockTransactionLine("Sales Revenue", "credit", amount),
+                ]
+            ))
+        
+        with count_queries() as queries:
+            assert await get_account_balance(db_session, "Cash") == 500.00
+        assert len(queries) == 1
+        assert await get_account_balance(db_session, "Sales Revenue") == 500.00
+        assert await get_account_balance(db_session, "Office Expenses") == 0.0
+        assert await get_account_balance(db_session, "No Such Account") == 0.0
+
+    @pytest.mark.asyncio
+    async def test_balance_by_id_is_signed_by_account_type(self, db_session: AsyncSession, setup_test_accounts, count_queries):
+        """Test that the by-id balance applies the normal side in a single statement"""
+        
+        await create_transaction(db_session, MockTransactionData(
+            description="Office supplies",
+            lines=[
+                MockTransactionLine("Office Expenses", "debit", 120.00),
+                MockTransactionLine("Accounts Payable", "credit", 120.00),
+            ]
+        ))
+        accounts = {account.name: account.id for account in setup_test_accounts}
+        
+        with count_queries() as queries:
+            expense = await get_account_balance_optimized(db_session, accounts["Office Expenses"])
+        assert len(queries) == 1
+        assert expense == {"debit_total": 120.0, "credit_total": 0.0, "balance": 120.0}
+        
+        payable = await get_account_balance_optimized(db_session, accounts["Accounts Payable"])
+        assert payable["balance"] == 120.0
@@ -53,7 +53,7 @@ const TransactionForm: React.FC<TransactionFormProps> = ({ onSuccess, onCancel }
 
   const fetchAccounts = async () => {
     try {
-      const response = await fetch('http://localhost:8000/api/v1/accounts', {
+      const response = await fetch('http://localhost:8000/api/v1/accounts?active_only=true', {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json',
@@ -62,7 +62,7 @@ const TransactionForm: React.FC<TransactionFormProps> = ({ onSuccess, onCancel }
 
       if (response.ok) {
         const data = await response.json();
-        setAccounts(data.filter((account: Account) => account.is_active));
+        setAccounts(data);
       }
     } catch (err) {
       console.error('Error fetching accounts:', err);